@@ -1,6 +1,8 @@
 import pandas as pd
 from typing import List
 
+from .missingness import missing_indicator_corr
+
 def compute_missing_corr(
     df: pd.DataFrame,
     missing_columns: List[str],
@@ -31,21 +33,5 @@ def compute_missing_corr(
     ValueError
         If none of the requested `missing_columns` are found in `df`.
     """
-    # Keep only columns present in the DataFrame
-    valid_missing_cols = [c for c in missing_columns if c in df.columns]
-    if not valid_missing_cols:
-        raise ValueError("None of the specified columns are present in the DataFrame.")
-
-    # Create the 0-vs-other binary flag
-    binary_flag_name = f"{indicator_col}_0_vs_other"
-    df = df.copy()  # prevent side effects on the original DataFrame
-    df[binary_flag_name] = (df[indicator_col] == 0).astype(int)
-
-    # Build the missing-value mask (1 if missing, 0 otherwise)
-    missing_matrix = df[valid_missing_cols].isnull().astype(int)
-
-    # Append the binary flag to the mask
-    missing_matrix[binary_flag_name] = df[binary_flag_name]
-
-    # Compute and return the correlation matrix
-    return missing_matrix.corr()
\ No newline at end of file
+    # Null masks are packed to bits once; the correlations come from popcounts
+    return missing_indicator_corr(df, missing_columns, indicator_col)
@@ -1,9 +1,13 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 
+from .lazy import lazy_module
+
+# Imported on first use, so the module loads without matplotlib
+plt = lazy_module("matplotlib.pyplot")
+
 def plot_categorical_distribution(df, column, category_order=None, title=None, 
                                 figsize=(8, 6), show_summary=True, 
-                                missing_label='Missing'):
+                                missing_label='Missing', show=True):
     """
     Plot categorical distribution with counts and percentages.
     
@@ -15,6 +19,7 @@ def plot_categorical_distribution(df, column, category_order=None, title=None,
     figsize: tuple for figure size
     show_summary: bool to print summary table
     missing_label: label for missing values
+    show: bool to call plt.show(); False leaves the figure open for saving
     """
     
     # Handle missing values and create series
@@ -111,7 +116,8 @@ def plot_categorical_distribution(df, column, category_order=None, title=None,
     plt.tight_layout()
     plt.subplots_adjust(bottom=0.15)
     
-    plt.show()
+    if show:
+        plt.show()
     
     # Summary table
     if show_summary:
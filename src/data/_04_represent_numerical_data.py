@@ -1,9 +1,15 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+from .binning import BinSpec, bin_counts
+from .lazy import lazy_module
+from .parsing import parse_series
+
+# Imported on first use, so the module loads without matplotlib
+plt = lazy_module("matplotlib.pyplot")
+
 def plot_percentage_distribution(df, column, bins=None, title=None, 
-                               figsize=(10, 6), show_summary=True):
+                               figsize=(10, 6), show_summary=True, show=True):
     """
     Plot percentage distribution with binned categories.
     
@@ -14,18 +20,12 @@ def plot_percentage_distribution(df, column, bins=None, title=None,
     title: chart title (optional)
     figsize: tuple for figure size
     show_summary: bool to print summary table
+    show: bool to call plt.show(); False leaves the figure open for saving
     """
     
-    # Convert percentage strings to numeric values
-    def clean_percentage(val):
-        if pd.isna(val):
-            return np.nan
-        if isinstance(val, str) and val.endswith('%'):
-            return float(val.rstrip('%'))
-        return float(val)
-    
-    # Clean the data
-    numeric_data = df[column].apply(clean_percentage)
+    # Convert percentage strings ('80%') to numeric values; unparseable
+    # entries count as missing
+    numeric_data, _ = parse_series(df[column], 'percentage')
     
     # Define default bins if not provided
     if bins is None:
@@ -41,18 +41,17 @@ def plot_percentage_distribution(df, column, bins=None, title=None,
         # Custom bins provided
         bin_labels = [f'{int(bins[i])}-{int(bins[i+1])}%' for i in range(len(bins)-1)]
     
-    # Create categories
-    binned_data = pd.cut(numeric_data, bins=bins, labels=bin_labels, include_lowest=True)
-    
-    # Add missing category
-    binned_data = binned_data.cat.add_categories(['Missing'])
-    binned_data = binned_data.fillna('Missing')
+    # Create categories (bounded bins, right-closed, lowest edge included;
+    # missing and out-of-range values go to 'Missing', placed last)
+    spec = BinSpec(edges=bins, labels=bin_labels, nan_label='Missing', nan_first=False)
+    binned_data = pd.Series(
+        pd.Categorical.from_codes(spec.codes(numeric_data.to_numpy()), dtype=spec.dtype),
+        index=numeric_data.index,
+        name=column,
+    )
     
-    # Get counts and percentages
-    counts = binned_data.value_counts()
-    # Reorder to put Missing last
-    if 'Missing' in counts.index:
-        counts = counts.reindex([label for label in bin_labels if label in counts.index] + ['Missing'])
+    # Get counts in category order (bin labels, then Missing)
+    counts = bin_counts(binned_data)
     
     percentages = (counts / counts.sum() * 100).round(1)
     
@@ -134,7 +133,8 @@ def plot_percentage_distribution(df, column, bins=None, title=None,
     plt.tight_layout()
     plt.subplots_adjust(bottom=0.15)
     
-    plt.show()
+    if show:
+        plt.show()
     
     # Summary table
     if show_summary:
@@ -0,0 +1,190 @@
+import json
+import re
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Named amenity groups: each value is a regex matched against single
+# amenity tokens (e.g. "Central air conditioning"), case-sensitive.
+AMENITY_MAPPING = {
+    'air_conditioning': 'Air conditioning|Central air conditioning|Portable air conditioning',
+    'elevator': 'Elevator',
+    'fast_wifi': 'Fast wifi|Ethernet connection',
+    'parking': 'parking',
+    'coffee_machine': 'Coffee maker|Espresso machine|Nespresso',
+    'washer': 'Free washer|Paid washer|Washer',
+    'self_check_in': 'Self check-in|Lockbox',
+    'streaming_tv': 'Netflix|Amazon Prime Video|Disney+|Apple TV|Chromecast|HDTV',
+    'dedicated_workspace': 'Dedicated workspace',
+    'private_entrance': 'Private entrance',
+    'kitchen_appliances': 'Refrigerator|oven|stove|Microwave',
+    'heating': 'Heating|Radiant heating',
+    'hot_water': 'Hot water',
+    'safety_equipment': 'First aid kit|Fire extinguisher',
+    'clothing_storage': 'Clothing storage|closet|wardrobe',
+    'balcony': 'Balcony|Patio|Terrace',
+    'premium_views': 'Canal view|Park view|Courtyard view',
+    'dishwasher': 'Dishwasher',
+    'gym': 'Private gym|Shared gym|Exercise equipment|Gym',
+}
+
+# Older Inside Airbnb dumps use '{Wifi,"Air conditioning"}' instead of JSON
+_LEGACY_STRIP = re.compile(r'[{}\[\]"]')
+
+
+def parse_amenities(raw) -> List[str]:
+    """
+    Parse one raw ``amenities`` value into a list of amenity names.
+
+    Accepts the JSON list format (``'["Wifi", "Kitchen"]'``) and the legacy
+    brace format (``'{Wifi,Kitchen}'``). Missing / empty values give ``[]``.
+    """
+    if not isinstance(raw, str):
+        return []
+    raw = raw.strip()
+    if raw.startswith('['):
+        try:
+            return [str(tok).strip() for tok in json.loads(raw)]
+        except ValueError:
+            pass
+    return [tok.strip() for tok in _LEGACY_STRIP.sub('', raw).split(',') if tok.strip()]
+
+
+def build_amenity_matrix(
+    amenities: pd.Series,
+    vocabulary: Optional[Mapping[str, int]] = None,
+) -> Tuple[sparse.csr_matrix, Dict[str, int]]:
+    """
+    Tokenize every amenity list once and build a listings × amenities matrix.
+
+    Parameters
+    ----------
+    amenities : pd.Series
+        Raw ``amenities`` column (one JSON list per listing).
+    vocabulary : Mapping[str, int] | None, optional
+        Fixed amenity ➜ column mapping (e.g. learnt on the training data).
+        • None  – build the vocabulary from *amenities*
+        • given – amenities outside the vocabulary are ignored
+
+    Returns
+    -------
+    matrix : scipy.sparse.csr_matrix, shape (n_listings, n_amenities), int8
+        1 where the listing offers the amenity.
+    vocabulary : dict[str, int]
+        Amenity name ➜ column index.
+    """
+    grow = vocabulary is None
+    vocab: Dict[str, int] = {} if grow else dict(vocabulary)
+
+    values = amenities.to_numpy(dtype=object)
+    indptr = np.zeros(len(values) + 1, dtype=np.int64)
+    indices: List[int] = []
+
+    for i, raw in enumerate(values):
+        tokens = parse_amenities(raw)
+        if grow:
+            row = {vocab.setdefault(tok, len(vocab)) for tok in tokens}
+        else:
+            row = {vocab[tok] for tok in tokens if tok in vocab}
+        indices.extend(sorted(row))
+        indptr[i + 1] = len(indices)
+
+    indices_arr = np.asarray(indices, dtype=np.int32)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices_arr), dtype=np.int8), indices_arr, indptr),
+        shape=(len(values), len(vocab)),
+    )
+    return matrix, vocab
+
+
+def amenity_group_indicator(
+    vocabulary: Mapping[str, int],
+    mapping: Mapping[str, str] = AMENITY_MAPPING,
+) -> sparse.csr_matrix:
+    """
+    Sparse amenities × groups matrix: 1 where the amenity matches the
+    group's regex. Regexes are evaluated once per vocabulary entry, not per
+    listing.
+    """
+    rows: List[int] = []
+    cols: List[int] = []
+    for j, pattern in enumerate(mapping.values()):
+        regex = re.compile(pattern)
+        for token, idx in vocabulary.items():
+            if regex.search(token):
+                rows.append(idx)
+                cols.append(j)
+
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(vocabulary), len(mapping)),
+    )
+
+
+def amenity_group_flags(
+    matrix: sparse.csr_matrix,
+    vocabulary: Mapping[str, int],
+    mapping: Mapping[str, str] = AMENITY_MAPPING,
+    index: Optional[pd.Index] = None,
+) -> pd.DataFrame:
+    """
+    Named amenity groups as 0/1 columns: each group is the union of the
+    matrix columns whose amenity matches the group's regex.
+
+    Parameters
+    ----------
+    matrix : scipy.sparse.csr_matrix
+        Output of ``build_amenity_matrix``.
+    vocabulary : Mapping[str, int]
+        Vocabulary that goes with *matrix*.
+    mapping : Mapping[str, str], default AMENITY_MAPPING
+        Group name ➜ regex over amenity names.
+    index : pd.Index | None, optional
+        Index of the returned DataFrame (usually the listings' index).
+
+    Returns
+    -------
+    pd.DataFrame
+        One int8 column per group.
+    """
+    hits = matrix @ amenity_group_indicator(vocabulary, mapping)
+    flags = (hits.toarray() > 0).astype(np.int8)
+    return pd.DataFrame(flags, columns=list(mapping), index=index)
+
+
+def amenity_support(matrix: sparse.csr_matrix, vocabulary: Mapping[str, int]) -> pd.Series:
+    """
+    Number of listings offering each amenity, most common first.
+    """
+    names = np.empty(len(vocabulary), dtype=object)
+    for token, idx in vocabulary.items():
+        names[idx] = token
+    counts = np.bincount(matrix.indices, minlength=len(vocabulary))
+    return pd.Series(counts, index=names, name="listings").sort_values(ascending=False)
+
+
+def add_amenity_features(
+    df: pd.DataFrame,
+    column: str = 'amenities',
+    mapping: Mapping[str, str] = AMENITY_MAPPING,
+    vocabulary: Optional[Mapping[str, int]] = None,
+) -> Tuple[pd.DataFrame, sparse.csr_matrix, Dict[str, int]]:
+    """
+    Add one 0/1 column per named amenity group to *df*.
+
+    Returns
+    -------
+    df : pd.DataFrame
+        Input DataFrame with the group columns added.
+    matrix : scipy.sparse.csr_matrix
+        Full listings × amenities matrix, for finer-grained features.
+    vocabulary : dict[str, int]
+        Amenity name ➜ column index of *matrix*.
+    """
+    matrix, vocab = build_amenity_matrix(df[column], vocabulary)
+    flags = amenity_group_flags(matrix, vocab, mapping, index=df.index)
+    df = df.drop(columns=[c for c in flags.columns if c in df.columns])
+    df = pd.concat([df, flags], axis=1)
+    return df, matrix, vocab
@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Tuple
+from pandas.api.types import CategoricalDtype
+
+
+@dataclass(frozen=True)
+class BinSpec:
+    """
+    Declarative description of an ordinal binning.
+
+    Parameters
+    ----------
+    edges : Sequence[float]
+        Bin edges in increasing order.
+        • ``len(labels) - 1`` edges → open-ended bins: the first label
+          catches everything below ``edges[0]``, the last label everything
+          above ``edges[-1]``.
+        • ``len(labels) + 1`` edges → bounded bins (``pd.cut`` style with
+          ``include_lowest=True``): values outside ``[edges[0], edges[-1]]``
+          receive *nan_label*.
+    labels : Sequence[str]
+        Category names, worst ➜ best (or low ➜ high).
+    nan_label : str
+        Category assigned to missing values.
+    right : bool, default True
+        • True  – bins are closed on the right: ``(a, b]``
+        • False – bins are closed on the left:  ``[a, b)``
+    nan_first : bool, default True
+        Put *nan_label* before (True) or after (False) the regular labels
+        in the ordered dtype.
+    """
+
+    edges: Tuple[float, ...]
+    labels: Tuple[str, ...]
+    nan_label: str
+    right: bool = True
+    nan_first: bool = True
+
+    def __post_init__(self):
+        object.__setattr__(self, "edges", tuple(float(e) for e in self.edges))
+        object.__setattr__(self, "labels", tuple(self.labels))
+
+        n_edges, n_labels = len(self.edges), len(self.labels)
+        if n_edges not in (n_labels - 1, n_labels + 1):
+            raise ValueError(
+                f"Expected {n_labels - 1} (open) or {n_labels + 1} (bounded) "
+                f"edges for {n_labels} labels, got {n_edges}."
+            )
+        if np.any(np.diff(self.edges) < 0):
+            raise ValueError("Bin edges must be sorted in increasing order.")
+        if self.nan_label in self.labels:
+            raise ValueError(f"nan_label '{self.nan_label}' clashes with a bin label.")
+
+    @property
+    def bounded(self) -> bool:
+        return len(self.edges) == len(self.labels) + 1
+
+    @property
+    def categories(self) -> List[str]:
+        if self.nan_first:
+            return [self.nan_label, *self.labels]
+        return [*self.labels, self.nan_label]
+
+    @property
+    def dtype(self) -> CategoricalDtype:
+        return CategoricalDtype(categories=self.categories, ordered=True)
+
+    def codes(self, values: np.ndarray) -> np.ndarray:
+        """
+        Map a float array (any shape) to int8 category codes of ``self.dtype``.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        inner = np.asarray(self.edges[1:-1] if self.bounded else self.edges)
+
+        # Number of edges strictly below (right-closed) or at-or-below
+        # (left-closed) each value == index of the bin it falls in.
+        side = "left" if self.right else "right"
+        bin_idx = np.searchsorted(inner, values, side=side).astype(np.int8)
+
+        offset = 1 if self.nan_first else 0
+        nan_code = 0 if self.nan_first else len(self.labels)
+        codes = bin_idx + np.int8(offset)
+
+        missing = np.isnan(values)
+        if self.bounded:
+            lo, hi = self.edges[0], self.edges[-1]
+            missing |= (values < lo) | ((values > hi) if self.right else (values >= hi))
+        codes[missing] = nan_code
+        return codes
+
+
+def bin_columns(
+    df: pd.DataFrame,
+    specs: Mapping[str, BinSpec],
+    *,
+    inplace: bool = False,
+    report: bool = False,
+) -> pd.DataFrame:
+    """
+    Recode numeric columns into ordered categoricals according to *specs*.
+
+    Columns that share the same ``BinSpec`` are binned together with a
+    single ``np.searchsorted`` call over their stacked values.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Table of listings.
+    specs : Mapping[str, BinSpec]
+        Column name ➜ binning to apply.
+    inplace : bool, default False
+        • False – work on a copy and return it
+        • True  – modify *df* directly (also returned)
+    report : bool, default False
+        Print the category distribution of every binned column.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with the chosen columns recoded as ordered categoricals.
+    """
+    missing_cols = [c for c in specs if c not in df.columns]
+    if missing_cols:
+        raise KeyError(f"Columns not found in the DataFrame: {missing_cols}")
+
+    if not inplace:
+        df = df.copy()
+
+    # Group columns by spec so each distinct binning runs once
+    groups: Dict[BinSpec, List[str]] = {}
+    for col, spec in specs.items():
+        groups.setdefault(spec, []).append(col)
+
+    for spec, cols in groups.items():
+        values = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = spec.codes(values)
+        dtype = spec.dtype
+        for j, col in enumerate(cols):
+            df[col] = pd.Categorical.from_codes(codes[:, j], dtype=dtype)
+            if report:
+                print_bin_distribution(df[col], nan_label=spec.nan_label)
+
+    return df
+
+
+def bin_counts(series: pd.Series) -> pd.Series:
+    """
+    Counts per category of an ordered categorical, in category order,
+    including empty categories.
+    """
+    codes = series.cat.codes.to_numpy()
+    categories = series.cat.categories
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    return pd.Series(counts, index=categories, name=series.name)
+
+
+def print_bin_distribution(
+    series: pd.Series,
+    nan_label: str | None = None,
+    width: int = 60,
+) -> None:
+    """
+    Print the count / percentage table of a binned column.
+    """
+    counts = bin_counts(series)
+    total = len(series)
+    percentages = counts / max(total, 1) * 100
+    nan_count = int(counts.get(nan_label, 0)) if nan_label is not None else 0
+
+    print(f"Successfully converted '{series.name}' to categorical")
+    print(f"Records processed: {total:,} | Missing values handled: {nan_count:,}")
+
+    print("\nCategory Distribution:")
+    print("-" * width)
+    for category, count, pct in zip(counts.index, counts, percentages):
+        print(f"{category:<35} {count:>8,} {pct:>6.1f}%")
+    print("-" * width)
+    print(f"{'Total':<35} {total:>8,} {'100.0%':>6}")
@@ -0,0 +1,185 @@
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+from .parsing import parse_series
+
+CALENDAR_COLUMNS = ["listing_id", "date", "available", "price"]
+
+# listing_id stays int64: current Inside Airbnb ids (~1e18) overflow int32.
+# It is mapped to int32 slots internally while aggregating.
+CALENDAR_READ_DTYPES = {
+    "listing_id": "int64",
+    "available": "bool",
+    "price": "string",
+}
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def clean_calendar_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast one raw calendar chunk to compact dtypes.
+
+    • date      → datetime64 (fixed '%Y-%m-%d' format)
+    • available → bool ('t' / 'f')
+    • price     → float32 ('$1,234.00' → 1234.0, empty or invalid → NaN),
+                  with the shared "currency" parsing kernel
+    """
+    chunk["date"] = pd.to_datetime(chunk["date"], format="%Y-%m-%d")
+    if "price" in chunk.columns:
+        chunk["price"] = parse_series(chunk["price"], "currency")[0].astype(np.float32)
+    return chunk
+
+
+def iter_calendar_chunks(
+    path: Union[str, Path],
+    chunksize: int = 1_000_000,
+    usecols=CALENDAR_COLUMNS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream ``calendar.csv`` in typed chunks of at most *chunksize* rows.
+    """
+    dtypes = {c: t for c, t in CALENDAR_READ_DTYPES.items() if c in usecols}
+    reader = pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype=dtypes,
+        true_values=["t"],
+        false_values=["f"],
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        yield clean_calendar_chunk(chunk)
+
+
+class CalendarAggregator:
+    """
+    Incremental per-listing calendar features.
+
+    Feed typed chunks with ``update`` and call ``result`` at the end; only
+    one row of state per listing is kept, so memory does not depend on
+    how many days the calendar covers.
+    """
+
+    def __init__(self):
+        self._ids = pd.Index([], dtype="int64")
+        self._state: Dict[str, np.ndarray] = {
+            "calendar_days": np.zeros(0, dtype=np.int32),
+            "available_days": np.zeros(0, dtype=np.int32),
+            "price_sum": np.zeros(0, dtype=np.float64),
+            "price_count": np.zeros(0, dtype=np.int32),
+            "price_min": np.zeros(0, dtype=np.float32),
+            "price_max": np.zeros(0, dtype=np.float32),
+            "first_day": np.zeros(0, dtype=np.int32),
+            "last_day": np.zeros(0, dtype=np.int32),
+        }
+
+    _FILL = {
+        "price_min": np.inf,
+        "price_max": -np.inf,
+        "first_day": np.iinfo(np.int32).max,
+        "last_day": np.iinfo(np.int32).min,
+    }
+
+    def _slots(self, uniques: np.ndarray) -> np.ndarray:
+        """Map listing ids to state slots, growing the state for new ids."""
+        slots = self._ids.get_indexer(uniques)
+        new = slots == -1
+        if new.any():
+            n_old, n_new = len(self._ids), int(new.sum())
+            self._ids = self._ids.append(pd.Index(uniques[new], dtype="int64"))
+            for name, arr in self._state.items():
+                pad = np.full(n_new, self._FILL.get(name, 0), dtype=arr.dtype)
+                self._state[name] = np.concatenate([arr, pad])
+            slots[new] = np.arange(n_old, n_old + n_new)
+        return slots.astype(np.int32)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        codes, uniques = pd.factorize(chunk["listing_id"].to_numpy(), sort=False)
+        n = len(uniques)
+        slots = self._slots(uniques)
+        st = self._state
+
+        st["calendar_days"][slots] += np.bincount(codes, minlength=n).astype(np.int32)
+        st["available_days"][slots] += np.bincount(
+            codes, weights=chunk["available"].to_numpy(dtype=np.float64), minlength=n
+        ).astype(np.int32)
+
+        days = (chunk["date"].to_numpy().astype("datetime64[D]") - _EPOCH).astype(np.int32)
+        first = np.full(n, self._FILL["first_day"], dtype=np.int32)
+        last = np.full(n, self._FILL["last_day"], dtype=np.int32)
+        np.minimum.at(first, codes, days)
+        np.maximum.at(last, codes, days)
+        st["first_day"][slots] = np.minimum(st["first_day"][slots], first)
+        st["last_day"][slots] = np.maximum(st["last_day"][slots], last)
+
+        if "price" in chunk.columns:
+            price = chunk["price"].to_numpy(dtype=np.float32, na_value=np.nan)
+            valid = ~np.isnan(price)
+            pc, pv = codes[valid], price[valid]
+            st["price_sum"][slots] += np.bincount(pc, weights=pv, minlength=n)
+            st["price_count"][slots] += np.bincount(pc, minlength=n).astype(np.int32)
+            pmin = np.full(n, np.inf, dtype=np.float32)
+            pmax = np.full(n, -np.inf, dtype=np.float32)
+            np.minimum.at(pmin, pc, pv)
+            np.maximum.at(pmax, pc, pv)
+            st["price_min"][slots] = np.minimum(st["price_min"][slots], pmin)
+            st["price_max"][slots] = np.maximum(st["price_max"][slots], pmax)
+
+    def result(self) -> pd.DataFrame:
+        """
+        Per-listing calendar features, indexed by ``listing_id``.
+        """
+        st = self._state
+        has_price = st["price_count"] > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            price_mean = (st["price_sum"] / st["price_count"]).astype(np.float32)
+            availability_rate = (st["available_days"] / st["calendar_days"]).astype(np.float32)
+
+        return pd.DataFrame(
+            {
+                "calendar_days": st["calendar_days"],
+                "available_days": st["available_days"],
+                "availability_rate": availability_rate,
+                "calendar_price_mean": np.where(has_price, price_mean, np.nan).astype(np.float32),
+                "calendar_price_min": np.where(has_price, st["price_min"], np.nan).astype(np.float32),
+                "calendar_price_max": np.where(has_price, st["price_max"], np.nan).astype(np.float32),
+                "calendar_first_date": _EPOCH + st["first_day"].astype("timedelta64[D]"),
+                "calendar_last_date": _EPOCH + st["last_day"].astype("timedelta64[D]"),
+            },
+            index=pd.Index(self._ids, name="listing_id"),
+        )
+
+
+def aggregate_calendar(
+    path: Union[str, Path],
+    chunksize: int = 1_000_000,
+    usecols=CALENDAR_COLUMNS,
+) -> pd.DataFrame:
+    """
+    Stream ``calendar.csv`` chunk by chunk and return per-listing features.
+
+    Peak memory is one chunk plus one row of state per listing, regardless
+    of calendar length.
+
+    Parameters
+    ----------
+    path : str | Path
+        Location of ``calendar.csv``.
+    chunksize : int, default 1_000_000
+        Rows parsed per chunk.
+    usecols : list[str], default CALENDAR_COLUMNS
+        Columns to read; must include listing_id, date and available.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per listing_id with availability and calendar-price features.
+    """
+    agg = CalendarAggregator()
+    for chunk in iter_calendar_chunks(path, chunksize=chunksize, usecols=usecols):
+        agg.update(chunk)
+    return agg.result()
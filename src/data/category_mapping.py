@@ -0,0 +1,174 @@
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._02b_dictionary_mapping import host_location_dict
+from ._02c_dictionary_mapping import CATEGORY_ORDER, LOCATION_HIERARCHY
+from ._02d_property_type_mapping import property_type_dict
+from .location_resolver import LocationResolver
+
+
+class CategoryMapper:
+    """
+    Chain of dictionary lookups compiled onto category codes.
+
+    The input is turned into a categorical once; each distinct value goes
+    through every stage in turn (``stages[0]``, then ``stages[1]`` on the
+    result, ...) and the outcome is stored as one int lookup array indexed by
+    input code. Mapping a column is then a single ``take`` over its codes, so
+    ``s.map(d1).map(d2)`` becomes one pass and no intermediate object column.
+
+    Parameters
+    ----------
+    *stages : dict
+        Mappings applied in order. A value missing from any stage is unmapped.
+    categories : Sequence | None, optional
+        Output categories in display order. Defaults to the sorted values of
+        the last stage.
+    ordered : bool, default False
+        Whether the output categorical is ordered.
+    fallback : callable | None, optional
+        Called with a value missing from the first stage; its result (or
+        None) replaces the first-stage lookup.
+    """
+
+    def __init__(
+        self,
+        *stages: Dict,
+        categories: Optional[Sequence] = None,
+        ordered: bool = False,
+        fallback: Optional[Callable] = None,
+    ):
+        if not stages:
+            raise ValueError("At least one mapping stage is required.")
+        self.stages = stages
+        self.fallback = fallback
+        if categories is None:
+            categories = sorted(set(stages[-1].values()), key=str)
+        self.dtype = pd.CategoricalDtype(categories=list(categories), ordered=ordered)
+        self._out_code = {c: i for i, c in enumerate(self.dtype.categories)}
+        self._memo: Dict[Hashable, int] = {}
+
+    def _resolve(self, value) -> int:
+        """Output code of one distinct input value (-1 if unmapped)."""
+        code = self._memo.get(value)
+        if code is None:
+            result = self.stages[0].get(value)
+            if result is None and self.fallback is not None:
+                result = self.fallback(value)
+            for stage in self.stages[1:]:
+                if result is None:
+                    break
+                result = stage.get(result)
+            code = self._out_code.get(result, -1) if result is not None else -1
+            self._memo[value] = code
+        return code
+
+    def compile(self, categories: Sequence) -> np.ndarray:
+        """
+        Lookup array for the given input categories.
+
+        The extra trailing slot maps input code -1 (missing) to -1, so
+        ``lookup[codes]`` needs no masking.
+        """
+        lookup = np.full(len(categories) + 1, -1, dtype=np.int16)
+        lookup[:-1] = [self._resolve(c) for c in categories]
+        return lookup
+
+    def transform(self, values: pd.Series, report: bool = False) -> Tuple[pd.Series, pd.Series]:
+        """
+        Map a column through every stage.
+
+        Parameters
+        ----------
+        values : pd.Series
+            Raw values (object or categorical).
+        report : bool, default False
+            Print the unmapped values.
+
+        Returns
+        -------
+        mapped : pd.Series
+            Categorical with ``self.dtype``; NaN where unmapped or missing.
+        unmapped : pd.Series
+            Row count of each non-missing input value that did not map,
+            most frequent first.
+        """
+        cat = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+        in_codes = cat.cat.codes.to_numpy()
+        in_categories = cat.cat.categories
+
+        lookup = self.compile(in_categories)
+        out_codes = lookup[in_codes]
+
+        # Per-category row counts come from the codes, not from an isna() scan
+        counts = np.bincount(in_codes[in_codes >= 0], minlength=len(in_categories))
+        miss = (lookup[:-1] == -1) & (counts > 0)
+        unmapped = (
+            pd.Series(counts[miss], index=in_categories[miss], name="count", dtype=np.int64)
+            .sort_values(ascending=False, kind="stable")
+        )
+
+        if report:
+            if len(unmapped):
+                print(f"Unmapped values in '{values.name}' ({int(unmapped.sum())} rows):")
+                print(unmapped.to_string())
+            else:
+                print(f"All values in '{values.name}' mapped.")
+
+        mapped = pd.Series(
+            pd.Categorical.from_codes(out_codes, dtype=self.dtype),
+            index=values.index,
+            name=values.name,
+        )
+        return mapped, unmapped
+
+
+# host_location → region (_02b) → location hierarchy (_02c), fused
+HOST_LOCATION_MAPPER = CategoryMapper(host_location_dict, LOCATION_HIERARCHY, categories=CATEGORY_ORDER)
+
+PROPERTY_TYPE_MAPPER = CategoryMapper(property_type_dict)
+
+
+@lru_cache(maxsize=1)
+def fuzzy_host_location_mapper() -> CategoryMapper:
+    """Like ``HOST_LOCATION_MAPPER`` but unseen strings go through ``LocationResolver``."""
+    resolver = LocationResolver.from_dictionaries()
+    return CategoryMapper(
+        host_location_dict,
+        LOCATION_HIERARCHY,
+        categories=CATEGORY_ORDER,
+        fallback=resolver.resolve,
+    )
+
+
+def map_host_location(
+    df: pd.DataFrame,
+    column: str = "host_location",
+    report: bool = True,
+    fuzzy: bool = False,
+) -> pd.Series:
+    """
+    Replace ``df[column]`` with its location-hierarchy category, in place.
+
+    Equivalent to ``.map(host_location_dict).map(LOCATION_HIERARCHY)``. With
+    ``fuzzy=True``, strings missing from ``host_location_dict`` (new
+    snapshots: "Milano, Lombardia", "Roma", ...) are matched by
+    ``LocationResolver`` instead of becoming NaN.
+    Returns the unmapped-value report.
+    """
+    mapper = fuzzy_host_location_mapper() if fuzzy else HOST_LOCATION_MAPPER
+    df[column], unmapped = mapper.transform(df[column], report=report)
+    return unmapped
+
+
+def map_property_type(df: pd.DataFrame, column: str = "property_type", report: bool = True) -> pd.Series:
+    """
+    Replace ``df[column]`` with its ``property_type_dict`` group, in place.
+
+    Returns the unmapped-value report.
+    """
+    df[column], unmapped = PROPERTY_TYPE_MAPPER.transform(df[column], report=report)
+    return unmapped
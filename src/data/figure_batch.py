@@ -0,0 +1,222 @@
+import hashlib
+import importlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+# Plot kind ➜ (module, function). Every function takes ``(df, column, ...)``
+# and a ``show`` flag, and draws on the current pyplot figure.
+PLOT_FUNCTIONS: Dict[str, Tuple[str, str]] = {
+    "categorical": ("._03_represent_categorical_data", "plot_categorical_distribution"),
+    "percentage": ("._04_represent_numerical_data", "plot_percentage_distribution"),
+    "missing_corr": (".preprocessing", "plot_missing_corr_heatmap"),
+}
+
+FIGURE_FORMATS = ("png", "svg")
+
+# Bump when the plotting code changes in a way that should invalidate the cache
+_CACHE_VERSION = 1
+_MANIFEST_FILE = "_figures.json"
+
+
+@dataclass
+class PlotSpec:
+    """
+    One chart of a batch.
+
+    Parameters
+    ----------
+    kind : str
+        Key of ``PLOT_FUNCTIONS``.
+    column : str | Sequence[str]
+        Second argument of the plot function: the plotted column, or the
+        list of ``missing_columns`` for "missing_corr".
+    params : dict, optional
+        Other keyword arguments of the plot function (title, bins, ...).
+    name : str | None, optional
+        Output file stem. Defaults to ``{kind}_{column}``; required when
+        *column* is a list.
+    """
+
+    kind: str
+    column: Union[str, Sequence[str]]
+    params: Dict[str, Any] = field(default_factory=dict)
+    name: Optional[str] = None
+
+    def __post_init__(self):
+        if self.kind not in PLOT_FUNCTIONS:
+            raise ValueError(f"Unknown plot kind '{self.kind}'. Expected one of {list(PLOT_FUNCTIONS)}.")
+        if not isinstance(self.column, str):
+            self.column = list(self.column)
+        if self.name is None:
+            if not isinstance(self.column, str):
+                raise ValueError(f"A '{self.kind}' spec over several columns needs a name.")
+            self.name = f"{self.kind}_{self.column}"
+
+    def input_columns(self, df: pd.DataFrame) -> List[str]:
+        """Columns of *df* the chart reads (the only data sent to a worker)."""
+        if isinstance(self.column, str):
+            return [self.column]
+        indicator = self.params.get("indicator_col", "number_of_reviews")
+        return [c for c in self.column if c in df.columns] + [indicator]
+
+
+def figure_hash(spec: PlotSpec, data: pd.DataFrame, formats: Sequence[str], dpi: int) -> str:
+    """
+    SHA-256 of the chart's input data (values, index and dtypes) and of
+    every parameter that affects the output files.
+    """
+    digest = hashlib.sha256()
+    header = {
+        "version": _CACHE_VERSION,
+        "kind": spec.kind,
+        "column": spec.column,
+        "params": spec.params,
+        "formats": list(formats),
+        "dpi": dpi,
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=repr).encode())
+    for col in data.columns:
+        digest.update(f"{col}:{data[col].dtype}".encode())
+        digest.update(pd.util.hash_pandas_object(data[col], index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _plot_function(kind: str):
+    module, name = PLOT_FUNCTIONS[kind]
+    return getattr(importlib.import_module(module, __package__), name)
+
+
+def _init_worker() -> None:
+    # Workers never display anything: select the non-interactive backend
+    # before pyplot is first imported in the process
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+
+
+def _render(
+    spec: PlotSpec,
+    data: pd.DataFrame,
+    paths: List[str],
+    dpi: int,
+) -> Tuple[str, Optional[str]]:
+    """Draw one chart and save it to *paths*. Returns (name, error or None)."""
+    import matplotlib.pyplot as plt
+
+    params = dict(spec.params)
+    if spec.kind in ("categorical", "percentage"):
+        params.setdefault("show_summary", False)
+    try:
+        _plot_function(spec.kind)(data, spec.column, show=False, **params)
+        fig = plt.gcf()
+        for path in paths:
+            fig.savefig(path, dpi=dpi, bbox_inches="tight")
+        return spec.name, None
+    except Exception as exc:  # one bad chart must not stop the batch
+        return spec.name, f"{type(exc).__name__}: {exc}"
+    finally:
+        plt.close("all")
+
+
+def _read_manifest(out_dir: Path) -> Dict[str, str]:
+    path = out_dir / _MANIFEST_FILE
+    if not path.exists():
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def render_figures(
+    df: pd.DataFrame,
+    specs: Sequence[PlotSpec],
+    out_dir: Union[str, Path],
+    *,
+    formats: Sequence[str] = ("png",),
+    dpi: int = 150,
+    n_jobs: Optional[int] = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """
+    Render many charts to files, headless and in parallel.
+
+    Each chart is keyed by ``figure_hash`` of its input columns and
+    parameters; charts whose hash and files are unchanged since the last
+    run are skipped. Workers use the Agg backend and receive only the
+    columns their chart reads.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data shared by all specs.
+    specs : Sequence[PlotSpec]
+        Charts to render (names must be unique).
+    out_dir : str | Path
+        Destination directory; files are ``{name}.{format}``.
+    formats : Sequence[str], default ("png",)
+        Any of ``FIGURE_FORMATS``.
+    dpi : int, default 150
+        Raster resolution (PNG).
+    n_jobs : int | None, optional
+        Worker processes. None ➜ ``os.cpu_count()``; 1 renders in this
+        process without a pool (and without changing its backend).
+    force : bool, default False
+        Re-render every chart regardless of the cache.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per spec: status ("rendered", "cached" or "failed"),
+        files, error.
+    """
+    unknown = [f for f in formats if f not in FIGURE_FORMATS]
+    if unknown:
+        raise ValueError(f"Unsupported figure formats {unknown}. Expected any of {FIGURE_FORMATS}.")
+    names = [spec.name for spec in specs]
+    duplicated = sorted({n for n in names if names.count(n) > 1})
+    if duplicated:
+        raise ValueError(f"Duplicate figure names: {duplicated}")
+    missing_cols = sorted({c for spec in specs for c in spec.input_columns(df) if c not in df.columns})
+    if missing_cols:
+        raise KeyError(f"Columns not found in the DataFrame: {missing_cols}")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(out_dir)
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    todo: List[Tuple[PlotSpec, pd.DataFrame, List[str], str]] = []
+    for spec in specs:
+        data = df[spec.input_columns(df)]
+        digest = figure_hash(spec, data, formats, dpi)
+        paths = [str(out_dir / f"{spec.name}.{fmt}") for fmt in formats]
+        rows[spec.name] = {"status": "cached", "files": paths, "error": None}
+        if force or manifest.get(spec.name) != digest or not all(os.path.exists(p) for p in paths):
+            todo.append((spec, data, paths, digest))
+
+    digests = {spec.name: digest for spec, _, _, digest in todo}
+    if todo:
+        n_jobs = min(n_jobs or os.cpu_count() or 1, len(todo))
+        if n_jobs == 1:
+            results = [_render(spec, data, paths, dpi) for spec, data, paths, _ in todo]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker) as pool:
+                futures = [pool.submit(_render, spec, data, paths, dpi) for spec, data, paths, _ in todo]
+                results = [future.result() for future in futures]
+
+        for name, error in results:
+            if error is None:
+                rows[name]["status"] = "rendered"
+                manifest[name] = digests[name]
+            else:
+                rows[name].update(status="failed", error=error)
+                manifest.pop(name, None)
+        with open(out_dir / _MANIFEST_FILE, "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("name")
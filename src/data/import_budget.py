@@ -0,0 +1,109 @@
+"""
+Import-time guard for the lightweight part of ``src.data``.
+
+Each module is imported in a fresh interpreter; the check fails when it
+pulls in a heavy dependency or when its cost on top of ``import numpy,
+pandas`` exceeds the budget.
+
+    python -m src.data.import_budget [--budget-ms 50] [--repeat 3]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List, Sequence
+
+import pandas as pd
+
+# Modules that must import with numpy and pandas only
+LIGHT_MODULES = (
+    "src.data.preprocessing",
+    "src.data._02_feature_engineering",
+    "src.data._03_represent_categorical_data",
+    "src.data._04_represent_numerical_data",
+    "src.data.binning",
+    "src.data.missingness",
+    "src.data.parsing",
+    "src.data.temporal",
+    "src.data.reviews",
+    "src.data.figure_batch",
+)
+
+# Loaded only on first use by the modules above
+HEAVY_MODULES = ("matplotlib", "seaborn", "missingno", "geopandas")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import numpy, pandas
+t1 = time.perf_counter()
+import {module}
+t2 = time.perf_counter()
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"baseline_ms": 1000 * (t1 - t0), "module_ms": 1000 * (t2 - t1), "heavy": heavy}}))
+"""
+
+
+def measure_import(module: str, heavy: Sequence[str] = HEAVY_MODULES) -> Dict:
+    """Import *module* in a fresh interpreter; return its timings and the heavy modules it loaded."""
+    probe = _PROBE.format(module=module, heavy=tuple(heavy))
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_import_budget(
+    modules: Sequence[str] = LIGHT_MODULES,
+    budget_ms: float = 50.0,
+    repeat: int = 3,
+) -> pd.DataFrame:
+    """
+    Import-cost report of *modules*.
+
+    Parameters
+    ----------
+    modules : Sequence[str], default LIGHT_MODULES
+        Dotted module names (importable from the current directory).
+    budget_ms : float, default 50.0
+        Allowed import time on top of numpy + pandas.
+    repeat : int, default 3
+        Fresh-interpreter runs per module; the fastest one is kept.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per module: module_ms, heavy (list), ok.
+    """
+    rows: List[Dict] = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        best = min(runs, key=lambda r: r["module_ms"])
+        heavy = sorted({m for r in runs for m in r["heavy"]})
+        rows.append(
+            {
+                "module": module,
+                "module_ms": round(best["module_ms"], 1),
+                "heavy": heavy,
+                "ok": best["module_ms"] <= budget_ms and not heavy,
+            }
+        )
+    return pd.DataFrame(rows).set_index("module")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    report = check_import_budget(budget_ms=args.budget_ms, repeat=args.repeat)
+    print(report.to_string())
+    failed = report.index[~report["ok"]].tolist()
+    if failed:
+        print(f"\nOver budget or importing heavy dependencies: {failed}")
+        return 1
+    print(f"\nAll {len(report)} modules within {args.budget_ms:.0f} ms and free of {list(HEAVY_MODULES)}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    ``plt = lazy_module("matplotlib.pyplot")`` at module top costs nothing;
+    the real import happens the first time ``plt.<name>`` is used, so code
+    paths that never plot never pay for matplotlib (or seaborn, missingno,
+    geopandas, ...).
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Deferred ``import name``; see ``LazyModule``."""
+    return LazyModule(name)
@@ -0,0 +1,252 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from ._02_feature_engineering import (
+    FIRST_REVIEW_AGE_BINS,
+    LAST_REVIEW_RECENCY_BINS,
+    REVIEW_SCORE_BINS,
+)
+from .amenities import AMENITY_MAPPING, amenity_group_flags, build_amenity_matrix
+from .category_mapping import HOST_LOCATION_MAPPER, PROPERTY_TYPE_MAPPER, fuzzy_host_location_mapper
+from .parsing import parse_series
+from .temporal import MISSING_DAY, day_deltas, day_numbers
+
+# Columns removed by 02_data_preprocessing.ipynb (identifiers, URLs, free text,
+# redundant counts and the >45 % missing fields)
+DROP_COLUMNS = [
+    "name", "host_name", "scrape_id", "source", "calendar_last_scraped",
+    "picture_url", "host_url", "host_thumbnail_url", "host_picture_url",
+    "license", "host_verifications", "instant_bookable",
+    "minimum_nights", "maximum_nights",
+    "minimum_minimum_nights", "maximum_minimum_nights",
+    "minimum_maximum_nights", "maximum_maximum_nights",
+    "bathrooms_text",
+    "calculated_host_listings_count_entire_homes",
+    "calculated_host_listings_count_shared_rooms",
+    "has_availability", "num_missing_reviews",
+    "neighbourhood_group_cleansed", "calendar_updated",
+    "neighbourhood", "host_neighbourhood", "description",
+    "host_response_time", "host_acceptance_rate", "host_response_rate",
+    "listing_url", "host_has_profile_pic", "host_id",
+    "availability_30", "availability_60", "availability_90", "availability_365",
+]
+
+# Free text reduced to a present/absent flag
+PRESENCE_COLUMNS = ["host_about", "neighborhood_overview"]
+PRESENCE_DEFAULT = "No description provided"
+
+REVIEW_SCORE_COLUMNS = [
+    "review_scores_value",
+    "review_scores_cleanliness",
+    "review_scores_location",
+    "review_scores_checkin",
+    "review_scores_communication",
+    "review_scores_accuracy",
+    "review_scores_rating",
+]
+REVIEW_COLUMNS = REVIEW_SCORE_COLUMNS + ["first_review", "last_review", "reviews_per_month"]
+
+BOOLEAN_COLUMNS = ["host_is_superhost", "host_identity_verified"]
+
+ROOM_TYPE_ORDER = ["Shared room", "Private room", "Hotel room", "Entire home/apt"]
+
+# Conditional imputation by raw property_type
+BEDROOM_MAP = {
+    "Shared room in rental unit": 0,
+    "Shared room in hostel": 0,
+    "Shared room in bed and breakfast": 0,
+    "Private room in rental unit": 1,
+    "Room in hotel": 1,
+}
+BATHROOM_MAP = {
+    "Room in hotel": 1,
+    "Private room in rental unit": 1,
+}
+
+
+def _impute_by_property_type(values: pd.Series, property_type: pd.Series, mapping: Dict[str, int]) -> np.ndarray:
+    out = values.to_numpy(dtype=np.float64, copy=True)
+    missing = np.isnan(out)
+    if missing.any():
+        out[missing] = property_type[missing].map(mapping).to_numpy(dtype=np.float64, na_value=np.nan)
+    return out
+
+
+def training_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    Boolean mask of the listings 02_data_preprocessing.ipynb keeps for
+    training: no partially-missing review block, known price and beds, and
+    bedrooms / bathrooms known after the property-type imputation.
+
+    Scoring never filters rows; apply this to the training frame only.
+    """
+    reviews = df[[c for c in REVIEW_COLUMNS if c in df.columns]].isna().to_numpy()
+    keep = reviews.all(axis=1) | ~reviews.any(axis=1)
+    keep &= df["price"].notna().to_numpy() & df["beds"].notna().to_numpy()
+    keep &= ~np.isnan(_impute_by_property_type(df["bedrooms"], df["property_type"], BEDROOM_MAP))
+    keep &= ~np.isnan(_impute_by_property_type(df["bathrooms"], df["property_type"], BATHROOM_MAP))
+    return keep
+
+
+class ListingPreprocessor(BaseEstimator, TransformerMixin):
+    """
+    The cleaning of ``02_data_preprocessing.ipynb`` as a fitted transformer.
+
+    ``fit`` learns everything that depends on the training data (modes used
+    for imputation, the amenity groups frequent enough to keep, category
+    orders of the pass-through categoricals); ``transform`` then applies all
+    steps column by column and assembles the output frame once, without
+    intermediate copies of the whole table:
+
+    • drop ``DROP_COLUMNS``;
+    • ``host_about`` / ``neighborhood_overview`` → ``*_present`` bool;
+    • ``host_location`` → location-hierarchy category, mode-filled;
+    • review scores → ordered review categories;
+    • ``first_review`` / ``last_review`` / ``host_since`` → days before
+      ``last_scraped`` (review ages binned into their categories);
+    • ``reviews_per_month`` NaN → 0;
+    • ``host_is_superhost`` / ``host_identity_verified`` → bool, mode-filled;
+    • ``beds`` filled from ``accommodates``; ``bedrooms`` / ``bathrooms``
+      from ``BEDROOM_MAP`` / ``BATHROOM_MAP``;
+    • ``room_type`` ordered, ``property_type`` grouped;
+    • ``amenities`` → int8 group flags;
+    • ``price`` strings → float.
+
+    Rows are never dropped; use ``training_rows`` for the notebook's
+    training filters.
+
+    Parameters
+    ----------
+    fuzzy_location : bool, default False
+        Resolve host locations missing from ``host_location_dict`` with
+        ``LocationResolver`` instead of imputing them with the mode.
+    amenity_min_support : float, default 0.10
+        Amenity groups offered by fewer listings than this share are dropped.
+    amenity_keep : Sequence[str], default ("balcony", "gym")
+        Amenity groups kept regardless of support.
+    categorical_columns : Sequence[str], default ("neighbourhood_cleansed",)
+        Pass-through string columns stored as categoricals whose categories
+        are learnt in ``fit`` (unseen values become NaN).
+    """
+
+    def __init__(
+        self,
+        fuzzy_location: bool = False,
+        amenity_min_support: float = 0.10,
+        amenity_keep: Sequence[str] = ("balcony", "gym"),
+        categorical_columns: Sequence[str] = ("neighbourhood_cleansed",),
+    ):
+        self.fuzzy_location = fuzzy_location
+        self.amenity_min_support = amenity_min_support
+        self.amenity_keep = amenity_keep
+        self.categorical_columns = categorical_columns
+
+    def _location_mapper(self):
+        return fuzzy_host_location_mapper() if self.fuzzy_location else HOST_LOCATION_MAPPER
+
+    def fit(self, X: pd.DataFrame, y=None) -> "ListingPreprocessor":
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+
+        raw_location = X["host_location"]
+        self.host_location_mode_ = raw_location.mode().iloc[0]
+        mapped, _ = self._location_mapper().transform(raw_location.fillna(self.host_location_mode_))
+        self.host_location_category_mode_ = mapped.mode().iloc[0]
+
+        self.boolean_modes_ = {col: X[col].mode().iloc[0] for col in BOOLEAN_COLUMNS if col in X.columns}
+
+        if "amenities" in X.columns:
+            matrix, vocab = build_amenity_matrix(X["amenities"])
+            support = amenity_group_flags(matrix, vocab, AMENITY_MAPPING).mean()
+            self.amenity_columns_ = [
+                col for col in AMENITY_MAPPING
+                if support[col] >= self.amenity_min_support or col in self.amenity_keep
+            ]
+        else:
+            self.amenity_columns_ = []
+
+        self.categories_ = {
+            col: pd.CategoricalDtype(sorted(X[col].dropna().unique()))
+            for col in self.categorical_columns
+            if col in X.columns
+        }
+        self.feature_names_out_ = list(self.transform(X.iloc[:0]).columns)
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        out: Dict[str, object] = {}
+        index = X.index
+        # Parsed once; every date column is diffed against these day numbers
+        reference = day_numbers(X["last_scraped"])
+
+        review_codes = None
+        review_cols = [c for c in REVIEW_SCORE_COLUMNS if c in X.columns]
+        if review_cols:
+            # One searchsorted over all score columns
+            review_codes = REVIEW_SCORE_BINS.codes(X[review_cols].to_numpy(dtype=np.float64, na_value=np.nan))
+
+        for col in X.columns:
+            if col in DROP_COLUMNS:
+                continue
+            values = X[col]
+
+            if col in PRESENCE_COLUMNS:
+                present = values.notna().to_numpy() & (values != PRESENCE_DEFAULT).to_numpy()
+                out[f"{col}_present"] = present
+            elif col == "host_location":
+                mapped, _ = self._location_mapper().transform(values.fillna(self.host_location_mode_))
+                out[col] = mapped.fillna(self.host_location_category_mode_).array
+            elif col in review_cols:
+                codes = review_codes[:, review_cols.index(col)]
+                out[col] = pd.Categorical.from_codes(codes, dtype=REVIEW_SCORE_BINS.dtype)
+            elif col == "first_review":
+                days = day_deltas(reference, day_numbers(values))
+                out["days_since_first_review"] = pd.Categorical.from_codes(
+                    FIRST_REVIEW_AGE_BINS.codes(days), dtype=FIRST_REVIEW_AGE_BINS.dtype
+                )
+            elif col == "last_review":
+                days = day_deltas(reference, day_numbers(values))
+                out["days_since_last_review"] = pd.Categorical.from_codes(
+                    LAST_REVIEW_RECENCY_BINS.codes(days), dtype=LAST_REVIEW_RECENCY_BINS.dtype
+                )
+            elif col == "host_since":
+                out["days_since_host_since"] = day_deltas(reference, day_numbers(values))
+            elif col == "last_scraped":
+                dates = reference.astype("datetime64[D]").astype("datetime64[ns]")
+                dates[reference == MISSING_DAY] = np.datetime64("NaT")
+                out[col] = dates
+            elif col == "reviews_per_month":
+                out[col] = np.nan_to_num(values.to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+            elif col in self.boolean_modes_:
+                filled = values.fillna(self.boolean_modes_[col]).to_numpy()
+                out[col] = (filled == "t") | (filled == True)  # noqa: E712 – 't'/'f' or bool input
+            elif col == "beds" and "accommodates" in X.columns:
+                beds = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                out[col] = np.where(np.isnan(beds), X["accommodates"].round().to_numpy(dtype=np.float64), beds)
+            elif col == "bedrooms" and "property_type" in X.columns:
+                out[col] = _impute_by_property_type(values, X["property_type"], BEDROOM_MAP)
+            elif col == "bathrooms" and "property_type" in X.columns:
+                out[col] = _impute_by_property_type(values, X["property_type"], BATHROOM_MAP)
+            elif col == "room_type":
+                out[col] = pd.Categorical(values, categories=ROOM_TYPE_ORDER, ordered=True)
+            elif col == "property_type":
+                out[col] = PROPERTY_TYPE_MAPPER.transform(values)[0].array
+            elif col == "amenities":
+                matrix, vocab = build_amenity_matrix(values)
+                mapping = {name: AMENITY_MAPPING[name] for name in self.amenity_columns_}
+                flags = amenity_group_flags(matrix, vocab, mapping).to_numpy()
+                for j, name in enumerate(self.amenity_columns_):
+                    out[name] = flags[:, j]
+            elif col == "price":
+                out[col] = parse_series(values, "currency")[0].to_numpy(dtype=np.float64)
+            elif col in self.categories_:
+                out[col] = pd.Categorical(values, dtype=self.categories_[col])
+            else:
+                out[col] = values.to_numpy()
+
+        return pd.DataFrame(out, index=index, copy=False)
+
+    def get_feature_names_out(self, input_features: Optional[List[str]] = None) -> np.ndarray:
+        return np.asarray(self.feature_names_out_, dtype=object)
@@ -0,0 +1,185 @@
+import json
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from .spatial import METRIC_CRS, GEOGRAPHIC_CRS, read_neighbourhoods
+
+# Piazza del Duomo
+MILAN_CENTRE = (45.46421, 9.19193)  # (lat, lon)
+
+OUTSIDE = -1   # cell intersects no neighbourhood
+BOUNDARY = -2  # cell crossed by a boundary: resolve with point-in-polygon
+
+RASTER_DTYPE = np.dtype([("code", np.int16), ("dist_centre_m", np.float32)])
+
+
+class LocationRaster:
+    """
+    Precomputed lon/lat grid over the neighbourhood polygons.
+
+    Each cell stores the neighbourhood code and location features of its
+    centre, so scoring a coordinate is two array lookups. Only cells cut by
+    a boundary fall back to an exact point-in-polygon test.
+
+    Build once with ``LocationRaster.build`` and ``save``; scoring workers
+    call ``LocationRaster.load``, which memory-maps the grid so every process
+    shares the same pages.
+    """
+
+    def __init__(self, grid: np.ndarray, meta: dict, polygons=None):
+        self.grid = grid
+        self.meta = meta
+        self.names = np.asarray(meta["names"], dtype=object)
+        self.dtype = pd.CategoricalDtype(categories=list(self.names))
+        self._polygons = polygons
+        self._tree = None
+
+    # ------------------------------------------------------------------ build
+    @classmethod
+    def build(
+        cls,
+        geojson_path: Union[str, Path],
+        resolution: float = 0.0005,
+        centre: Tuple[float, float] = MILAN_CENTRE,
+        name_field: str = "neighbourhood",
+    ) -> "LocationRaster":
+        """
+        Rasterise ``neighbourhoods.geojson``.
+
+        Parameters
+        ----------
+        geojson_path : str | Path
+            Neighbourhood polygons (WGS84).
+        resolution : float, default 0.0005
+            Cell side in degrees (~40 m × 55 m in Milan).
+        centre : (lat, lon), default MILAN_CENTRE
+            Reference point for ``dist_centre_m``.
+        name_field : str, default "neighbourhood"
+            GeoJSON property holding the neighbourhood name.
+        """
+        from pyproj import Transformer
+
+        names, polygons = read_neighbourhoods(geojson_path, name_field)
+        lon0, lat0, lon1, lat1 = shapely.total_bounds(polygons)
+        nx = int(np.ceil((lon1 - lon0) / resolution))
+        ny = int(np.ceil((lat1 - lat0) / resolution))
+
+        iy, ix = np.divmod(np.arange(nx * ny), nx)
+        cell_lon0 = lon0 + ix * resolution
+        cell_lat0 = lat0 + iy * resolution
+        boxes = shapely.box(cell_lon0, cell_lat0, cell_lon0 + resolution, cell_lat0 + resolution)
+
+        shapely.prepare(polygons)
+        tree = shapely.STRtree(polygons)
+        codes = np.full(nx * ny, OUTSIDE, dtype=np.int16)
+        cell_idx, _ = tree.query(boxes, predicate="intersects")
+        codes[np.unique(cell_idx)] = BOUNDARY
+        inside_cell, inside_poly = tree.query(boxes, predicate="within")
+        codes[inside_cell] = inside_poly
+
+        to_metric = Transformer.from_crs(GEOGRAPHIC_CRS, METRIC_CRS, always_xy=True)
+        cx, cy = to_metric.transform(cell_lon0 + resolution / 2, cell_lat0 + resolution / 2)
+        ox, oy = to_metric.transform(centre[1], centre[0])
+
+        grid = np.empty((ny, nx), dtype=RASTER_DTYPE)
+        grid["code"] = codes.reshape(ny, nx)
+        grid["dist_centre_m"] = np.hypot(cx - ox, cy - oy).reshape(ny, nx)
+
+        meta = {
+            "lon0": float(lon0),
+            "lat0": float(lat0),
+            "resolution": float(resolution),
+            "shape": [ny, nx],
+            "centre": list(centre),
+            "names": [str(n) for n in names],
+            "geojson_path": str(Path(geojson_path).resolve()),
+            "name_field": name_field,
+        }
+        return cls(grid, meta, polygons)
+
+    # -------------------------------------------------------------- save/load
+    def save(self, path: Union[str, Path]) -> None:
+        """Write ``<path>.npy`` (grid) and ``<path>.json`` (metadata)."""
+        path = Path(path)
+        np.save(path.with_suffix(".npy"), self.grid)
+        path.with_suffix(".json").write_text(json.dumps(self.meta, indent=2))
+
+    @classmethod
+    def load(cls, path: Union[str, Path], geojson_path: Optional[Union[str, Path]] = None) -> "LocationRaster":
+        """
+        Memory-map a saved raster.
+
+        *geojson_path* overrides the polygon file recorded at build time; the
+        polygons are only read if a boundary cell is ever queried.
+        """
+        path = Path(path)
+        meta = json.loads(path.with_suffix(".json").read_text())
+        if geojson_path is not None:
+            meta["geojson_path"] = str(geojson_path)
+        grid = np.load(path.with_suffix(".npy"), mmap_mode="r")
+        return cls(grid, meta)
+
+    # ----------------------------------------------------------------- lookup
+    def _fallback(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Exact point-in-polygon for points in boundary cells."""
+        if self._polygons is None:
+            _, self._polygons = read_neighbourhoods(self.meta["geojson_path"], self.meta["name_field"])
+            shapely.prepare(self._polygons)
+        if self._tree is None:
+            self._tree = shapely.STRtree(self._polygons)
+
+        codes = np.full(len(lat), OUTSIDE, dtype=np.int16)
+        point_idx, poly_idx = self._tree.query(shapely.points(lon, lat), predicate="intersects")
+        order = np.lexsort((poly_idx, point_idx))  # lowest code wins on shared edges
+        point_idx, poly_idx = point_idx[order], poly_idx[order]
+        first = np.unique(point_idx, return_index=True)[1]
+        codes[point_idx[first]] = poly_idx[first]
+        return codes
+
+    def lookup(self, lat, lon) -> pd.DataFrame:
+        """
+        Neighbourhood and location features for arrays of coordinates.
+
+        Parameters
+        ----------
+        lat, lon : array-like of float
+            WGS84 coordinates.
+
+        Returns
+        -------
+        pd.DataFrame
+            ``neighbourhood`` (categorical, NaN outside Milan),
+            ``neighbourhood_code`` (int16, -1 outside) and ``dist_centre_m``
+            (float32, NaN outside the grid).
+        """
+        lat = np.atleast_1d(np.asarray(lat, dtype=np.float64))
+        lon = np.atleast_1d(np.asarray(lon, dtype=np.float64))
+        ny, nx = self.meta["shape"]
+        res = self.meta["resolution"]
+
+        with np.errstate(invalid="ignore"):
+            fx = (lon - self.meta["lon0"]) / res
+            fy = (lat - self.meta["lat0"]) / res
+        in_grid = (fx >= 0) & (fx < nx) & (fy >= 0) & (fy < ny)
+        ix = np.where(in_grid, fx, 0).astype(np.intp)
+        iy = np.where(in_grid, fy, 0).astype(np.intp)
+
+        cells = self.grid[iy, ix]
+        codes = np.where(in_grid, cells["code"], OUTSIDE).astype(np.int16)
+        dist = np.where(in_grid, cells["dist_centre_m"], np.nan).astype(np.float32)
+
+        boundary = np.flatnonzero(codes == BOUNDARY)
+        if len(boundary):
+            codes[boundary] = self._fallback(lat[boundary], lon[boundary])
+
+        return pd.DataFrame(
+            {
+                "neighbourhood": pd.Categorical.from_codes(codes, dtype=self.dtype),
+                "neighbourhood_code": codes,
+                "dist_centre_m": dist,
+            }
+        )
@@ -0,0 +1,174 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._02b_dictionary_mapping import host_location_dict
+from ._02c_dictionary_mapping import LOCATION_HIERARCHY
+
+# Italian (and a few other local) spellings → the English names used as keys
+# in host_location_dict, applied token by token after normalisation.
+TOKEN_ALIASES = {
+    "milano": "milan",
+    "roma": "rome",
+    "torino": "turin",
+    "napoli": "naples",
+    "firenze": "florence",
+    "venezia": "venice",
+    "genova": "genoa",
+    "padova": "padua",
+    "mantova": "mantua",
+    "italia": "italy",
+    "lombardia": "lombardy",
+    "piemonte": "piedmont",
+    "toscana": "tuscany",
+    "sicilia": "sicily",
+    "sardegna": "sardinia",
+    "puglia": "apulia",
+    "londra": "london",
+    "parigi": "paris",
+    "zurigo": "zurich",
+    "svizzera": "switzerland",
+    "schweiz": "switzerland",
+    "suisse": "switzerland",
+    "deutschland": "germany",
+    "espana": "spain",
+    "uk": "united kingdom",
+    "usa": "united states",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_location(value: str) -> str:
+    """
+    Canonical form of a free-text location.
+
+    Accents are stripped, case folded, punctuation dropped, tokens translated
+    through ``TOKEN_ALIASES`` and then de-duplicated and sorted, so
+    "Milano, Lombardia" and "lombardy milan" normalise identically.
+    """
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    tokens = []
+    for token in _NON_WORD.sub(" ", text).split():
+        tokens.extend(TOKEN_ALIASES.get(token, token).split())
+    return " ".join(sorted(set(tokens)))
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LocationResolver:
+    """
+    Fuzzy gazetteer for ``host_location`` strings missing from
+    ``host_location_dict``.
+
+    Every gazetteer entry is normalised (see ``normalize_location``) and
+    indexed by character trigrams. A query is resolved by, in order:
+
+    1. exact match of the normalised string;
+    2. first comma-separated part, left to right (most specific first), whose
+       best trigram (Jaccard) match clears *min_score*: "Navigli, Milano" →
+       "navigli" fails, "milan" matches;
+    3. best trigram match of the whole string.
+
+    Results are memoised per raw string, so a snapshot costs one lookup per
+    distinct location.
+
+    Parameters
+    ----------
+    gazetteer : dict
+        Raw location string → region (a key of ``LOCATION_HIERARCHY``).
+    min_score : float, default 0.6
+        Minimum trigram Jaccard similarity for a fuzzy match.
+    """
+
+    def __init__(self, gazetteer: Dict[str, str], min_score: float = 0.6):
+        self.min_score = float(min_score)
+
+        # Normalised entry → region; an entry reached from several raw keys
+        # with different regions is ambiguous and dropped.
+        regions: Dict[str, set] = defaultdict(set)
+        for raw, region in gazetteer.items():
+            regions[normalize_location(raw)].add(region)
+        self._exact = {
+            entry: next(iter(found))
+            for entry, found in regions.items()
+            if entry and len(found) == 1
+        }
+
+        self._entries = list(self._exact)
+        self._entry_sizes = np.array([len(_trigrams(e)) for e in self._entries], dtype=np.int32)
+        postings = defaultdict(list)
+        for i, entry in enumerate(self._entries):
+            for gram in _trigrams(entry):
+                postings[gram].append(i)
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._memo: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_dictionaries(cls, min_score: float = 0.6) -> "LocationResolver":
+        """
+        Gazetteer built from ``host_location_dict`` plus ``LOCATION_HIERARCHY``.
+
+        The city part of each dictionary key ("Bergamo" of "Bergamo, Italy")
+        is added as its own entry so bare city names resolve too.
+        """
+        gazetteer = {}
+        cities: Dict[str, set] = defaultdict(set)
+        for raw, region in host_location_dict.items():
+            gazetteer[raw] = region
+            if "," in raw:
+                cities[raw.split(",")[0]].add(region)
+        for city, found in cities.items():
+            if len(found) == 1 and city not in gazetteer:
+                gazetteer[city] = next(iter(found))
+        for region in LOCATION_HIERARCHY:
+            gazetteer.setdefault(region, region)
+        return cls(gazetteer, min_score=min_score)
+
+    def match(self, normalized: str) -> Tuple[Optional[str], float]:
+        """Best gazetteer entry for a normalised string, with its score."""
+        if normalized in self._exact:
+            return normalized, 1.0
+        grams = _trigrams(normalized)
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if not hits:
+            return None, 0.0
+        shared = np.bincount(np.concatenate(hits), minlength=len(self._entries))
+        score = shared / (len(grams) + self._entry_sizes - shared)
+        best = int(np.argmax(score))
+        return self._entries[best], float(score[best])
+
+    def resolve(self, value) -> Optional[str]:
+        """Region of one raw location string, or None if nothing is close."""
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return None
+        if value in self._memo:
+            return self._memo[value]
+
+        region = None
+        normalized = normalize_location(value)
+        candidates = [normalized] if normalized in self._exact else []
+        candidates += [normalize_location(part) for part in str(value).split(",")]
+        candidates.append(normalized)
+        for candidate in candidates:
+            entry, score = self.match(candidate)
+            if entry is not None and score >= self.min_score:
+                region = self._exact[entry]
+                break
+
+        self._memo[value] = region
+        return region
+
+    def resolve_series(self, values: pd.Series) -> pd.Series:
+        """Resolve a column, one lookup per distinct value."""
+        uniques = values.dropna().unique()
+        resolved = {u: self.resolve(u) for u in uniques}
+        return values.map(resolved)
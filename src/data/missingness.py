@@ -0,0 +1,160 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class MissingnessMatrix:
+    """
+    Null masks of many columns, computed once and stored as packed bits.
+
+    Row *r* of column *c* is bit *r* of ``packed[c]`` (``np.packbits``
+    order), so 8 rows take one byte instead of the 8 bytes of an int64
+    ``isnull().astype(int)`` frame. Pair statistics are popcounts of bitwise
+    ANDs and row masks are bitwise OR / AND reductions.
+
+    Parameters
+    ----------
+    columns : Sequence[str]
+        Names of the packed masks.
+    packed : np.ndarray[uint8], shape (n_columns, ceil(n_rows / 8))
+        Packed masks.
+    n_rows : int
+        Number of rows (the padding bits of the last byte are zero).
+    index : pd.Index | None, optional
+        Row labels, used by the row-mask methods.
+    """
+
+    def __init__(self, columns: Sequence[str], packed: np.ndarray, n_rows: int, index: Optional[pd.Index] = None):
+        self.columns = list(columns)
+        self.packed = packed
+        self.n_rows = int(n_rows)
+        self.index = index if index is not None else pd.RangeIndex(n_rows)
+        self._position = {c: i for i, c in enumerate(self.columns)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> "MissingnessMatrix":
+        """Pack ``df[col].isna()`` for every column in *columns* (default: all)."""
+        columns = list(df.columns if columns is None else columns)
+        n_bytes = (len(df) + 7) // 8
+        packed = np.empty((len(columns), n_bytes), dtype=np.uint8)
+        for i, col in enumerate(columns):
+            packed[i] = np.packbits(df[col].isna().to_numpy())
+        return cls(columns, packed, len(df), df.index)
+
+    def add_indicator(self, name: str, mask) -> "MissingnessMatrix":
+        """
+        Append an arbitrary boolean row flag (e.g. ``number_of_reviews == 0``)
+        so it takes part in the pair statistics.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != self.n_rows:
+            raise ValueError(f"Indicator '{name}' has {len(mask)} rows, expected {self.n_rows}.")
+        self.packed = np.vstack([self.packed, np.packbits(mask)[None, :]])
+        self.columns.append(name)
+        self._position[name] = len(self.columns) - 1
+        return self
+
+    # ------------------------------------------------------------- internals
+    def _rows(self, columns: Optional[Sequence[str]]) -> np.ndarray:
+        if columns is None:
+            return self.packed
+        unknown = [c for c in columns if c not in self._position]
+        if unknown:
+            raise KeyError(f"Columns not in the missingness matrix: {unknown}")
+        return self.packed[[self._position[c] for c in columns]]
+
+    def _unpack(self, packed_row: np.ndarray) -> np.ndarray:
+        return np.unpackbits(packed_row, count=self.n_rows).astype(bool)
+
+    # ------------------------------------------------------------ statistics
+    def counts(self) -> pd.Series:
+        """Missing values per column."""
+        return pd.Series(
+            np.bitwise_count(self.packed).sum(axis=1, dtype=np.int64),
+            index=self.columns,
+            name="n_missing",
+        )
+
+    def co_missing(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Symmetric matrix of rows where both columns are missing (the
+        diagonal is each column's own missing count).
+        """
+        names = self.columns if columns is None else list(columns)
+        bits = self._rows(columns)
+        k = len(bits)
+        both = np.empty((k, k), dtype=np.int64)
+        for i in range(k):
+            row = np.bitwise_count(bits[i] & bits[i:]).sum(axis=1, dtype=np.int64)
+            both[i, i:] = row
+            both[i:, i] = row
+        return pd.DataFrame(both, index=names, columns=names)
+
+    def phi(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Phi coefficients between the missing-value indicators: the same
+        numbers as ``df[columns].isnull().astype(int).corr()``, from counts
+        only. Columns that are never (or always) missing give NaN.
+        """
+        both = self.co_missing(columns)
+        n11 = both.to_numpy(dtype=np.float64)
+        n1 = np.diag(n11)
+        n = float(self.n_rows)
+        numerator = n * n11 - np.outer(n1, n1)
+        spread = n1 * (n - n1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = numerator / np.sqrt(np.outer(spread, spread))
+        constant = spread == 0
+        corr[constant, :] = np.nan
+        corr[:, constant] = np.nan
+        np.fill_diagonal(corr, np.where(constant, np.nan, 1.0))
+        return pd.DataFrame(corr, index=both.index, columns=both.columns)
+
+    # ------------------------------------------------------------- row masks
+    def any_missing(self, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Rows missing at least one of *columns*."""
+        return self._unpack(np.bitwise_or.reduce(self._rows(columns), axis=0))
+
+    def all_missing(self, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Rows missing every one of *columns*."""
+        return self._unpack(np.bitwise_and.reduce(self._rows(columns), axis=0))
+
+    def partial_missing(self, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Rows missing some, but not all, of *columns*."""
+        bits = self._rows(columns)
+        some = np.bitwise_or.reduce(bits, axis=0)
+        every = np.bitwise_and.reduce(bits, axis=0)
+        return self._unpack(some & ~every)
+
+    def row_counts(self, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Number of missing *columns* in each row."""
+        bits = self._rows(columns)
+        counts = np.zeros(self.n_rows, dtype=np.int32)
+        for row in bits:
+            counts += np.unpackbits(row, count=self.n_rows)
+        return counts
+
+
+def missing_indicator_corr(
+    df: pd.DataFrame,
+    missing_columns: List[str],
+    indicator_col: str = "number_of_reviews",
+) -> pd.DataFrame:
+    """
+    Phi correlations between the missing-value indicators of
+    *missing_columns* and the ``{indicator_col}_0_vs_other`` flag
+    (1 when *indicator_col* is 0). Does not modify *df*.
+
+    Raises
+    ------
+    ValueError
+        If none of the requested *missing_columns* are present in *df*.
+    """
+    valid_missing_cols = [c for c in missing_columns if c in df.columns]
+    if not valid_missing_cols:
+        raise ValueError("None of the specified columns are present in the DataFrame.")
+
+    matrix = MissingnessMatrix.from_frame(df, valid_missing_cols)
+    matrix.add_indicator(f"{indicator_col}_0_vs_other", (df[indicator_col] == 0).to_numpy())
+    return matrix.phi()
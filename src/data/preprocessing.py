@@ -1,6 +1,15 @@
 import pandas as pd
 from typing import List
 
+# Public names for ``from data.preprocessing import *`` (keeps the lazy
+# plt / sns stand-ins out of the caller's namespace)
+__all__ = [
+    "impute_and_create_binary_feature",
+    "plot_missing_corr_heatmap",
+    "partially_missing",
+    "partial_review_missing",
+]
+
 def impute_and_create_binary_feature(df, column_name, default_value="No description provided"):
     """
     Impute missing values in a specified column with a default value and create a binary indicator.
@@ -29,10 +38,16 @@ def impute_and_create_binary_feature(df, column_name, default_value="No descript
 
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import List, Tuple
 
+from .lazy import lazy_module
+from .missingness import MissingnessMatrix, missing_indicator_corr
+
+# Plotting libraries are imported on first use, so the transformation
+# functions of this module load with numpy and pandas only
+plt = lazy_module("matplotlib.pyplot")
+sns = lazy_module("seaborn")
+
 def plot_missing_corr_heatmap(
     df: pd.DataFrame,
     missing_columns: List[str],
@@ -43,6 +58,7 @@ def plot_missing_corr_heatmap(
     fmt: str = ".2f",
     linewidths: float = 0.5,
     title: str = "Correlation of Missing-Value Indicators",
+    show: bool = True,
 ) -> pd.DataFrame:
     """
     Compute the correlation matrix between:
@@ -70,6 +86,8 @@ def plot_missing_corr_heatmap(
         Grid line width between cells.
     title : str, default "Correlation of Missing-Value Indicators"
         Title shown above the heatmap.
+    show : bool, default True
+        Call ``plt.show()``; False leaves the figure open (e.g. for saving).
 
     Returns
     -------
@@ -81,30 +99,16 @@ def plot_missing_corr_heatmap(
     ValueError
         If none of the requested `missing_columns` are present in `df`.
     """
-    # 1. Keep only columns present in the DataFrame
-    valid_missing_cols = [c for c in missing_columns if c in df.columns]
-    if not valid_missing_cols:
-        raise ValueError("None of the specified columns are present in the DataFrame.")
-
-    # 2. Create the 0-vs-other binary flag
-    binary_flag_name = f"{indicator_col}_0_vs_other"
-    df = df.copy()                                   # avoid mutating the original DataFrame
-    df[binary_flag_name] = (df[indicator_col] == 0).astype(int)
-
-    # 3. Build the missing-value mask (1 if missing, 0 otherwise)
-    missing_matrix = df[valid_missing_cols].isnull().astype(int)
+    # 1. Phi correlations of the missing-value indicators and the 0-vs-other
+    #    flag, from bit-packed null masks (df is not copied or modified)
+    corr = missing_indicator_corr(df, missing_columns, indicator_col)
 
-    # 4. Append the binary flag to the mask
-    missing_matrix[binary_flag_name] = df[binary_flag_name]
-
-    # 5. Compute the correlation matrix
-    corr = missing_matrix.corr()
-
-    # 6. Plot the heatmap
+    # 2. Plot the heatmap
     plt.figure(figsize=figsize)
     sns.heatmap(corr, annot=annot, cmap=cmap, fmt=fmt, linewidths=linewidths)
     plt.title(title)
-    plt.show()
+    if show:
+        plt.show()
 
     return corr
 
@@ -112,21 +116,21 @@ def plot_missing_corr_heatmap(
 
 def partially_missing(df, review_columns):
 
-    # Conta quanti valori mancanti ci sono per riga nelle colonne delle review
-    df["num_missing_reviews"] = df[review_columns].isnull().sum(axis=1)
+    # Maschere di missing calcolate una sola volta (bit-packed)
+    missing = MissingnessMatrix.from_frame(df, review_columns)
 
-    # Filtra solo le righe che hanno almeno un valore mancante nei review scores
-    df_missing_reviews = df[df["num_missing_reviews"] > 0]
+    # Conta quanti valori mancanti ci sono per riga nelle colonne delle review
+    df["num_missing_reviews"] = missing.row_counts()
 
-    print(f"Listings con almeno un valore di review mancante: {len(df_missing_reviews)}")
+    print(f"Listings con almeno un valore di review mancante: {int(missing.any_missing().sum())}")
 
     # Identifica le righe che hanno TUTTE le review scores mancanti
-    all_missing = df_missing_reviews[review_columns].isnull().all(axis=1).sum()
+    all_missing = int(missing.all_missing().sum())
 
     print(f"Listings dove TUTTE le review scores sono mancanti: {all_missing}")
 
     # Identifica i listing con alcune ma non tutte le review scores mancanti
-    df_partial_missing_reviews = df_missing_reviews[~df_missing_reviews[review_columns].isnull().all(axis=1)]
+    df_partial_missing_reviews = df[missing.partial_missing()]
 
     # Include host_url for manual verification
     columns_to_display = review_columns + ["id"] + ["listing_url"] + ["number_of_reviews"]
@@ -173,10 +177,11 @@ def partial_review_missing(
     ids : list
         Values from *id_col* for those rows.
     """
-    # Boolean masks
-    any_missing = df[review_cols].isnull().any(axis=1)
-    all_missing = df[review_cols].isnull().all(axis=1)
-    partial_mask = any_missing & ~all_missing
+    # Boolean masks from one bit-packed pass over the review columns
+    missing = MissingnessMatrix.from_frame(df, review_cols)
+    any_missing = missing.any_missing()
+    all_missing = missing.all_missing()
+    partial_mask = missing.partial_missing()
 
     # Counts for console output
     n_any_missing = int(any_missing.sum())
@@ -0,0 +1,251 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .parsing import parse_series
+
+DIMENSIONS = ("neighbourhood", "room_type", "snapshot")
+
+
+class PricePerPersonCube:
+    """
+    Mergeable price-per-person quantile sketches by
+    (neighbourhood, room_type, snapshot).
+
+    Each cell is a log-bucketed histogram (DDSketch-style): bucket ``i``
+    covers ``(gamma**(i-1), gamma**i]`` with
+    ``gamma = (1 + alpha) / (1 - alpha)``, so any quantile read back is
+    within a relative error *alpha* of the exact one. Histograms merge by
+    addition, hence adding a snapshot or rolling cells up (all snapshots,
+    all room types, the whole city) never touches the raw listings.
+
+    Parameters
+    ----------
+    relative_accuracy : float, default 0.01
+        Maximum relative error *alpha* of returned quantiles.
+    min_value, max_value : float, default 1.0, 100_000.0
+        Range of prices per person resolved by the buckets; values outside
+        are clamped to the first / last bucket.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1.0,
+        max_value: float = 100_000.0,
+    ):
+        self.relative_accuracy = float(relative_accuracy)
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self._offset = int(np.ceil(np.log(min_value) / self._log_gamma))
+        self.n_buckets = int(np.ceil(np.log(max_value) / self._log_gamma)) - self._offset + 1
+
+        self.labels: Dict[str, List[str]] = {dim: [] for dim in DIMENSIONS}
+        self.counts = np.zeros((0, 0, 0, self.n_buckets), dtype=np.int32)
+
+    # ---------------------------------------------------------------- helpers
+    def _bucket(self, values: np.ndarray) -> np.ndarray:
+        values = np.clip(values, self.min_value, self.max_value)
+        idx = np.ceil(np.log(values) / self._log_gamma).astype(np.int64) - self._offset
+        return np.clip(idx, 0, self.n_buckets - 1)
+
+    def bucket_values(self) -> np.ndarray:
+        """Representative value of each bucket (relative error ≤ alpha)."""
+        upper = self.gamma ** (np.arange(self.n_buckets) + self._offset)
+        return 2 * upper / (self.gamma + 1)
+
+    def _codes(self, dim: str, values: pd.Series) -> np.ndarray:
+        """Codes of *values* along *dim*, registering unseen labels."""
+        labels = self.labels[dim]
+        lookup = {label: i for i, label in enumerate(labels)}
+        uniques, inverse = np.unique(values.astype(str).to_numpy(), return_inverse=True)
+        for u in uniques:
+            if u not in lookup:
+                lookup[u] = len(labels)
+                labels.append(u)
+        return np.array([lookup[u] for u in uniques], dtype=np.int64)[inverse]
+
+    def _grow(self) -> None:
+        shape = tuple(len(self.labels[d]) for d in DIMENSIONS) + (self.n_buckets,)
+        if shape != self.counts.shape:
+            grown = np.zeros(shape, dtype=self.counts.dtype)
+            n, r, s, _ = self.counts.shape
+            grown[:n, :r, :s] = self.counts
+            self.counts = grown
+
+    # ----------------------------------------------------------------- update
+    def add_snapshot(
+        self,
+        df: pd.DataFrame,
+        snapshot: str,
+        price_col: str = "price",
+        accommodates_col: str = "accommodates",
+        neighbourhood_col: str = "neighbourhood_cleansed",
+        room_type_col: str = "room_type",
+    ) -> "PricePerPersonCube":
+        """
+        Merge the listings of one snapshot into the cube.
+
+        Price per person is ``price / accommodates``; raw ``'$1,234.00'``
+        strings are accepted. Rows with missing price / neighbourhood / room
+        type or with ``accommodates <= 0`` are skipped. Adding the same snapshot label
+        twice merges both batches.
+        """
+        price = parse_series(df[price_col], "currency")[0].to_numpy(dtype=np.float64)
+        guests = pd.to_numeric(df[accommodates_col], errors="coerce").to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ppp = price / guests
+        valid = (
+            np.isfinite(ppp)
+            & (guests > 0)
+            & df[neighbourhood_col].notna().to_numpy()
+            & df[room_type_col].notna().to_numpy()
+        )
+        rows = df.loc[valid]
+
+        nb = self._codes("neighbourhood", rows[neighbourhood_col])
+        rt = self._codes("room_type", rows[room_type_col])
+        snap = self._codes("snapshot", pd.Series([snapshot]))[0]
+        self._grow()
+
+        n_nb, n_rt = len(self.labels["neighbourhood"]), len(self.labels["room_type"])
+        key = (nb * n_rt + rt) * self.n_buckets + self._bucket(ppp[valid])
+        hist = np.bincount(key, minlength=n_nb * n_rt * self.n_buckets)
+        self.counts[:, :, snap, :] += hist.reshape(n_nb, n_rt, self.n_buckets).astype(np.int32)
+        return self
+
+    def merge(self, other: "PricePerPersonCube") -> "PricePerPersonCube":
+        """Add every cell of *other* (same bucket layout) into this cube."""
+        layout = (self.gamma, self._offset, self.n_buckets)
+        if (other.gamma, other._offset, other.n_buckets) != layout:
+            raise ValueError("Cubes have different bucket layouts and cannot be merged.")
+        index = [self._codes(dim, pd.Series(other.labels[dim], dtype=object)) for dim in DIMENSIONS]
+        self._grow()
+        self.counts[np.ix_(*index)] += other.counts
+        return self
+
+    # ------------------------------------------------------------------ query
+    def _select(self, room_types=None, snapshots=None) -> np.ndarray:
+        counts = self.counts
+        for axis, dim, wanted in ((1, "room_type", room_types), (2, "snapshot", snapshots)):
+            if wanted is not None:
+                wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+                missing = [w for w in wanted if w not in self.labels[dim]]
+                if missing:
+                    raise KeyError(f"Unknown {dim}: {missing}")
+                idx = [self.labels[dim].index(w) for w in wanted]
+                counts = np.take(counts, idx, axis=axis)
+        return counts
+
+    def _quantiles_from_hist(self, hist: np.ndarray, q: float) -> np.ndarray:
+        """Quantile *q* of each histogram along the last axis (NaN if empty)."""
+        total = hist.sum(axis=-1)
+        cum = np.cumsum(hist, axis=-1)
+        target = np.maximum(np.ceil(q * total), 1)[..., None]
+        idx = np.argmax(cum >= target, axis=-1)
+        out = self.bucket_values()[idx]
+        return np.where(total > 0, out, np.nan)
+
+    def quantile(
+        self,
+        q: float = 0.5,
+        by: Sequence[str] = ("neighbourhood", "room_type"),
+        room_types: Optional[Union[str, Sequence[str]]] = None,
+        snapshots: Optional[Union[str, Sequence[str]]] = None,
+    ) -> pd.Series:
+        """
+        Quantile *q* of price per person, grouped by the dimensions in *by*.
+
+        Dimensions not in *by* are merged (e.g. ``by=("neighbourhood",)``
+        pools room types; leaving out "snapshot" pools snapshots).
+
+        Parameters
+        ----------
+        q : float, default 0.5
+            Quantile in [0, 1].
+        by : Sequence[str], default ("neighbourhood", "room_type")
+            Subset of "neighbourhood", "room_type", "snapshot".
+        room_types, snapshots : str | Sequence[str] | None, optional
+            Restrict to these labels before grouping.
+
+        Returns
+        -------
+        pd.Series
+            Indexed by the *by* dimensions; NaN for empty cells.
+        """
+        unknown = [d for d in by if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimensions {unknown}. Expected a subset of {DIMENSIONS}.")
+
+        counts = self._select(room_types, snapshots)
+        pooled = tuple(i for i, d in enumerate(DIMENSIONS) if d not in by)
+        hist = counts.sum(axis=pooled) if pooled else counts
+        values = self._quantiles_from_hist(hist, q)
+
+        kept = [d for d in DIMENSIONS if d in by]
+        level_labels = []
+        for dim in kept:
+            labels = self.labels[dim]
+            if dim == "room_type" and room_types is not None:
+                labels = [room_types] if isinstance(room_types, str) else list(room_types)
+            if dim == "snapshot" and snapshots is not None:
+                labels = [snapshots] if isinstance(snapshots, str) else list(snapshots)
+            level_labels.append(labels)
+
+        name = f"price_per_person_q{q:g}"
+        if not kept:
+            return pd.Series([float(values)], name=name)
+        if len(kept) > 1:
+            index = pd.MultiIndex.from_product(level_labels, names=kept)
+        else:
+            index = pd.Index(level_labels[0], name=kept[0])
+        return pd.Series(values.ravel(), index=index, name=name)
+
+    def counts_table(
+        self,
+        by: Sequence[str] = ("neighbourhood", "room_type"),
+        room_types=None,
+        snapshots=None,
+    ) -> pd.Series:
+        """Number of listings behind each cell of ``quantile(by=...)``."""
+        counts = self._select(room_types, snapshots).sum(axis=-1)
+        pooled = tuple(i for i, d in enumerate(DIMENSIONS) if d not in by)
+        totals = counts.sum(axis=pooled) if pooled else counts
+        ref = self.quantile(0.5, by=by, room_types=room_types, snapshots=snapshots)
+        return pd.Series(np.ravel(totals), index=ref.index, name="listings")
+
+    def median_map(self, room_type: str, snapshots=None) -> pd.Series:
+        """Median price per person by neighbourhood for one room type."""
+        return self.quantile(0.5, by=("neighbourhood",), room_types=room_type, snapshots=snapshots)
+
+    def geographic_premium(self, room_type: Optional[str] = None, snapshots=None) -> pd.Series:
+        """
+        Neighbourhood median over the city-wide median, minus one
+        (0.4 = 40 % premium).
+        """
+        local = self.quantile(0.5, by=("neighbourhood",), room_types=room_type, snapshots=snapshots)
+        city = float(self.quantile(0.5, by=(), room_types=room_type, snapshots=snapshots).iloc[0])
+        return (local / city - 1).rename("geographic_premium")
+
+    # -------------------------------------------------------------- save/load
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the cube to a compressed ``.npz`` file."""
+        np.savez_compressed(
+            path,
+            counts=self.counts,
+            params=np.array([self.relative_accuracy, self.min_value, self.max_value]),
+            **{f"labels_{d}": np.array(self.labels[d], dtype=str) for d in DIMENSIONS},
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PricePerPersonCube":
+        with np.load(path) as data:
+            alpha, lo, hi = data["params"]
+            cube = cls(alpha, lo, hi)
+            cube.labels = {d: data[f"labels_{d}"].tolist() for d in DIMENSIONS}
+            cube.counts = data["counts"]
+        return cube
@@ -0,0 +1,312 @@
+import csv
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .parsing import currency_kernel
+
+# Bump whenever a schema or conversion rule below changes: every cached
+# file written under an older version is then rebuilt on next load.
+CACHE_VERSION = 2
+
+# Columns not listed here are stored as strings, so the schema only depends
+# on the CSV header and never on pyarrow's type inference. Fields the
+# preprocessing parses itself ('$' prices, '%' rates, 't'/'f' flags) stay raw.
+LISTINGS_TYPES = {
+    "id": pa.int64(),
+    "scrape_id": pa.int64(),
+    "last_scraped": pa.date32(),
+    "host_id": pa.int64(),
+    "host_since": pa.date32(),
+    "host_listings_count": pa.float64(),
+    "host_total_listings_count": pa.float64(),
+    "latitude": pa.float64(),
+    "longitude": pa.float64(),
+    "accommodates": pa.int32(),
+    "bathrooms": pa.float64(),
+    "bedrooms": pa.float64(),
+    "beds": pa.float64(),
+    "minimum_nights": pa.int32(),
+    "maximum_nights": pa.int32(),
+    "minimum_minimum_nights": pa.float64(),
+    "maximum_minimum_nights": pa.float64(),
+    "minimum_maximum_nights": pa.float64(),
+    "maximum_maximum_nights": pa.float64(),
+    "minimum_nights_avg_ntm": pa.float64(),
+    "maximum_nights_avg_ntm": pa.float64(),
+    "availability_30": pa.int32(),
+    "availability_60": pa.int32(),
+    "availability_90": pa.int32(),
+    "availability_365": pa.int32(),
+    "calendar_last_scraped": pa.date32(),
+    "number_of_reviews": pa.int32(),
+    "number_of_reviews_ltm": pa.int32(),
+    "number_of_reviews_l30d": pa.int32(),
+    "first_review": pa.date32(),
+    "last_review": pa.date32(),
+    "review_scores_rating": pa.float64(),
+    "review_scores_accuracy": pa.float64(),
+    "review_scores_cleanliness": pa.float64(),
+    "review_scores_checkin": pa.float64(),
+    "review_scores_communication": pa.float64(),
+    "review_scores_location": pa.float64(),
+    "review_scores_value": pa.float64(),
+    "calculated_host_listings_count": pa.int32(),
+    "calculated_host_listings_count_entire_homes": pa.int32(),
+    "calculated_host_listings_count_private_rooms": pa.int32(),
+    "calculated_host_listings_count_shared_rooms": pa.int32(),
+    "reviews_per_month": pa.float64(),
+}
+
+CALENDAR_TYPES = {
+    "listing_id": pa.int64(),
+    "date": pa.date32(),
+    "available": pa.bool_(),
+    "price": pa.string(),           # '$1,234.00' → float32 after conversion
+    "adjusted_price": pa.string(),  # idem
+    "minimum_nights": pa.int32(),
+    "maximum_nights": pa.int32(),
+}
+
+REVIEWS_TYPES = {
+    "listing_id": pa.int64(),
+    "id": pa.int64(),
+    "date": pa.date32(),
+    "reviewer_id": pa.int64(),
+}
+
+REVIEWS_ID_DATE_TYPES = {
+    "listing_id": pa.int64(),
+    "date": pa.date32(),
+}
+
+RAW_SOURCES = {
+    "listings_extended": {"file": "listings_extended.csv", "types": LISTINGS_TYPES},
+    "calendar": {
+        "file": "calendar.csv",
+        "types": CALENDAR_TYPES,
+        "currency": ("price", "adjusted_price"),
+        "partition": "month",
+    },
+    "reviews": {"file": "reviews.csv", "types": REVIEWS_TYPES},
+    "reviews_id_date": {"file": "reviews_id_date.csv", "types": REVIEWS_ID_DATE_TYPES},
+}
+
+_META_FILE = "_meta.json"
+
+
+def file_sha256(path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file, read in *block_size* blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _csv_header(path: Path) -> List[str]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        return next(csv.reader(fh))
+
+
+def _convert_options(path: Path, types: Dict[str, pa.DataType]) -> pacsv.ConvertOptions:
+    column_types = {col: types.get(col, pa.string()) for col in _csv_header(path)}
+    return pacsv.ConvertOptions(
+        column_types=column_types,
+        true_values=["t"],
+        false_values=["f"],
+        strings_can_be_null=True,
+    )
+
+
+def _clean_batch(batch, currency: Sequence[str], partition: Optional[str]):
+    """Parse currency strings and add the partition key of a batch or table."""
+    names = batch.schema.names
+    columns = list(batch.columns)
+    for col in currency:
+        if col in names:
+            i = names.index(col)
+            columns[i] = pc.cast(currency_kernel(columns[i])[0], pa.float32())
+    if partition == "month":
+        dates = batch.column(names.index("date"))
+        month = pc.add(pc.multiply(pc.year(dates), 100), pc.month(dates))
+        columns.append(pc.cast(month, pa.int32()))
+        names = names + ["month"]
+    return type(batch).from_arrays(columns, names=names)
+
+
+def _write_cache(source: str, csv_path: Path, out_path: Path) -> List[str]:
+    """Convert *csv_path* to Parquet at *out_path*; return the data columns."""
+    spec = RAW_SOURCES[source]
+    partition = spec.get("partition")
+    currency = spec.get("currency", ())
+    read_options = pacsv.ReadOptions(block_size=64 << 20)
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    convert_options = _convert_options(csv_path, spec["types"])
+
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path) if tmp_path.is_dir() else tmp_path.unlink()
+
+    if partition is None:
+        table = pacsv.read_csv(
+            csv_path,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        table = _clean_batch(table, currency, None)
+        pq.write_table(table, tmp_path)
+        columns = table.schema.names
+    else:
+        # Stream the file batch by batch: the full CSV never sits in memory
+        reader = pacsv.open_csv(
+            csv_path,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        first = _clean_batch(reader.read_next_batch(), currency, partition)
+        batches = (_clean_batch(b, currency, partition) for b in reader)
+
+        def _all_batches():
+            yield first
+            yield from batches
+
+        ds.write_dataset(
+            _all_batches(),
+            tmp_path,
+            schema=first.schema,
+            format="parquet",
+            partitioning=[partition],
+            partitioning_flavor="hive",
+        )
+        columns = [c for c in first.schema.names if c != partition]
+
+    if out_path.exists():
+        shutil.rmtree(out_path) if out_path.is_dir() else out_path.unlink()
+    os.replace(tmp_path, out_path)
+    return columns
+
+
+def ensure_cached(
+    source: str,
+    raw_dir: Union[str, Path],
+    cache_dir: Optional[Union[str, Path]] = None,
+    verbose: bool = True,
+) -> Path:
+    """
+    Make sure the Parquet cache of *source* exists and matches its CSV.
+
+    The cache is rebuilt when the CSV's SHA-256 (or ``CACHE_VERSION``)
+    differs from the one recorded at conversion time. The hash is only
+    recomputed when the file's size or modification time changed.
+
+    Parameters
+    ----------
+    source : str
+        One of ``RAW_SOURCES``.
+    raw_dir : str | Path
+        Directory holding the Inside Airbnb CSV files (``data/raw``).
+    cache_dir : str | Path | None, optional
+        Where to keep the Parquet files. Defaults to
+        ``<raw_dir>/../interim/raw_cache``.
+    verbose : bool, default True
+        Print a line when the cache is (re)built.
+
+    Returns
+    -------
+    Path
+        Parquet file (or partitioned directory) of *source*.
+    """
+    if source not in RAW_SOURCES:
+        raise KeyError(f"Unknown raw source '{source}'. Expected one of {list(RAW_SOURCES)}.")
+
+    raw_dir = Path(raw_dir)
+    cache_dir = Path(cache_dir) if cache_dir is not None else raw_dir.parent / "interim" / "raw_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    csv_path = raw_dir / RAW_SOURCES[source]["file"]
+    out_path = cache_dir / f"{source}.parquet"
+    meta_path = cache_dir / f"{source}{_META_FILE}"
+
+    stat = csv_path.stat()
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+
+    same_version = meta.get("version") == CACHE_VERSION
+    unchanged_stat = meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns
+    if same_version and unchanged_stat and out_path.exists():
+        return out_path
+
+    sha = file_sha256(csv_path)
+    if not (same_version and meta.get("sha256") == sha and out_path.exists()):
+        if verbose:
+            print(f"Caching {csv_path.name} → {out_path}")
+        meta["columns"] = _write_cache(source, csv_path, out_path)
+
+    meta.update(
+        version=CACHE_VERSION,
+        sha256=sha,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+    )
+    meta_path.write_text(json.dumps(meta, indent=2))
+    return out_path
+
+
+def load_raw(
+    source: str,
+    raw_dir: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    filters=None,
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> pd.DataFrame:
+    """
+    Load a raw Inside Airbnb table through its Parquet cache.
+
+    Only the requested *columns* are read, with memory-mapped I/O. Dates come
+    back as ``datetime64``; calendar prices as float32.
+
+    Parameters
+    ----------
+    source : str
+        One of ``RAW_SOURCES``: "listings_extended", "calendar", "reviews",
+        "reviews_id_date".
+    raw_dir : str | Path
+        Directory holding the CSV files.
+    columns : Sequence[str] | None, optional
+        Columns to load (default: all data columns).
+    filters : optional
+        pyarrow filters, e.g. ``[("month", ">=", 202501)]`` to read only some
+        calendar partitions.
+    cache_dir : str | Path | None, optional
+        See ``ensure_cached``.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    path = ensure_cached(source, raw_dir, cache_dir)
+    if columns is None and RAW_SOURCES[source].get("partition"):
+        meta_path = path.with_name(f"{source}{_META_FILE}")
+        columns = json.loads(meta_path.read_text())["columns"]
+
+    table = pq.read_table(
+        path,
+        columns=list(columns) if columns is not None else None,
+        filters=filters,
+        memory_map=True,
+    )
+    return table.to_pandas(date_as_object=False)
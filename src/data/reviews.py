@@ -0,0 +1,193 @@
+from typing import Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _to_days(dates) -> np.ndarray:
+    """Dates (strings or datetime-like) → int32 days since 1970-01-01."""
+    dates = pd.Series(dates) if not isinstance(dates, pd.Series) else dates
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format="%Y-%m-%d")
+    return (dates.to_numpy().astype("datetime64[D]") - _EPOCH).astype(np.int32)
+
+
+class ReviewIndex:
+    """
+    Reviews sorted by (listing_id, date), with one contiguous block per listing.
+
+    All per-listing statistics are computed with ``reduceat`` over the block
+    starts, and membership tests use ``searchsorted`` on a packed
+    (listing, day) key instead of a hash merge.
+
+    Parameters
+    ----------
+    listing_id : array-like of int
+        Listing id of each review.
+    date : array-like
+        Review date (ISO strings or datetime-like).
+    """
+
+    def __init__(self, listing_id, date):
+        ids = np.asarray(listing_id, dtype=np.int64)
+        days = _to_days(date)
+
+        order = np.lexsort((days, ids))
+        self.ids = ids[order]
+        self.days = days[order]
+
+        n = len(self.ids)
+        is_start = np.ones(n, dtype=bool)
+        is_start[1:] = self.ids[1:] != self.ids[:-1]
+        self.starts = np.flatnonzero(is_start)
+        self.listing_ids = self.ids[self.starts]
+        self.counts = np.diff(np.append(self.starts, n)).astype(np.int32)
+
+        # Packed key: block number * day span + day offset. Monotone because
+        # blocks are sorted by id and days are sorted inside each block.
+        self._day_min = int(self.days.min()) if n else 0
+        self._day_span = int(self.days.max()) - self._day_min + 1 if n else 1
+        block = np.repeat(np.arange(len(self.starts), dtype=np.int64), self.counts)
+        self._keys = block * self._day_span + (self.days - self._day_min)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        id_col: str = "listing_id",
+        date_col: str = "date",
+    ) -> "ReviewIndex":
+        return cls(df[id_col].to_numpy(), df[date_col])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def contains(self, listing_id, date) -> np.ndarray:
+        """
+        Boolean mask: is each (listing_id, date) pair present in the index?
+        """
+        q_ids = np.asarray(listing_id, dtype=np.int64)
+        q_days = _to_days(date).astype(np.int64)
+
+        block = np.searchsorted(self.listing_ids, q_ids)
+        block_clipped = np.minimum(block, max(len(self.listing_ids) - 1, 0))
+        found = (block < len(self.listing_ids)) & (self.listing_ids[block_clipped] == q_ids)
+
+        offset = q_days - self._day_min
+        found &= (offset >= 0) & (offset < self._day_span)
+
+        q_keys = block_clipped * self._day_span + offset
+        pos = np.searchsorted(self._keys, q_keys)
+        pos_clipped = np.minimum(pos, max(len(self._keys) - 1, 0))
+        found &= (pos < len(self._keys)) & (self._keys[pos_clipped] == q_keys)
+        return found
+
+    def subset_report(self, other: pd.DataFrame, id_col: str = "listing_id", date_col: str = "date") -> pd.Series:
+        """
+        How many (listing_id, date) rows of *other* exist in this index.
+
+        Replaces ``other.merge(reviews, how='left', indicator=True)`` when only
+        containment matters.
+        """
+        mask = self.contains(other[id_col].to_numpy(), other[date_col])
+        n_found = int(mask.sum())
+        return pd.Series(
+            {"both": n_found, "left_only": len(mask) - n_found},
+            name="_merge",
+        )
+
+    def aggregate(
+        self,
+        reference_date: Union[str, pd.Timestamp, pd.Series, None] = None,
+        windows: Sequence[int] = (30, 90, 365),
+    ) -> pd.DataFrame:
+        """
+        Per-listing review timeline features in one vectorised pass.
+
+        Parameters
+        ----------
+        reference_date : str | Timestamp | pd.Series | None, optional
+            "Today" for the trailing windows:
+            • scalar    – same date for every listing
+            • pd.Series – per-listing date indexed by listing_id
+              (e.g. ``last_scraped``); listings missing from it use the
+              latest review date
+            • None      – latest review date in the index
+        windows : Sequence[int], default (30, 90, 365)
+            Trailing window lengths in days; each adds ``reviews_l{w}d``.
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by listing_id with columns n_reviews, first_review_date,
+            last_review_date, review_span_days, review_gap_mean_days,
+            review_gap_max_days and one ``reviews_l{w}d`` per window.
+        """
+        n_blocks = len(self.starts)
+        ends = self.starts + self.counts - 1
+        first = self.days[self.starts]
+        last = self.days[ends]
+
+        # Reference day per listing, then broadcast to rows
+        fallback = int(self.days.max()) if len(self.days) else 0
+        if reference_date is None:
+            ref = np.full(n_blocks, fallback, dtype=np.int32)
+        elif isinstance(reference_date, pd.Series):
+            ref_series = reference_date.reindex(self.listing_ids)
+            ref_dt = pd.to_datetime(ref_series, format="%Y-%m-%d")
+            ref = np.where(
+                ref_dt.isna().to_numpy(),
+                fallback,
+                (ref_dt.to_numpy().astype("datetime64[D]") - _EPOCH).astype(np.int64),
+            ).astype(np.int32)
+        else:
+            ref_day = (np.datetime64(pd.Timestamp(reference_date), "D") - _EPOCH).astype(np.int32)
+            ref = np.full(n_blocks, ref_day, dtype=np.int32)
+        row_ref = np.repeat(ref, self.counts)
+
+        # Gaps between consecutive reviews of the same listing (0 at block starts)
+        gaps = np.zeros(len(self.days), dtype=np.int32)
+        gaps[1:] = np.diff(self.days)
+        gaps[self.starts] = 0
+
+        span = (last - first).astype(np.int32)
+        multi = self.counts > 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            gap_mean = np.where(multi, span / (self.counts - 1), np.nan).astype(np.float32)
+        gap_max = np.maximum.reduceat(gaps, self.starts) if n_blocks else gaps[:0]
+
+        out = {
+            "n_reviews": self.counts,
+            "first_review_date": _EPOCH + first.astype("timedelta64[D]"),
+            "last_review_date": _EPOCH + last.astype("timedelta64[D]"),
+            "review_span_days": span,
+            "review_gap_mean_days": gap_mean,
+            "review_gap_max_days": np.where(multi, gap_max, np.nan).astype(np.float32),
+        }
+
+        age = row_ref - self.days
+        for w in windows:
+            in_window = ((age >= 0) & (age < w)).astype(np.int32)
+            out[f"reviews_l{w}d"] = (
+                np.add.reduceat(in_window, self.starts) if n_blocks else in_window[:0]
+            ).astype(np.int32)
+
+        return pd.DataFrame(out, index=pd.Index(self.listing_ids, name="listing_id"))
+
+
+def aggregate_reviews(
+    reviews: pd.DataFrame,
+    reference_date=None,
+    windows: Sequence[int] = (30, 90, 365),
+    id_col: str = "listing_id",
+    date_col: str = "date",
+) -> pd.DataFrame:
+    """
+    Build a ``ReviewIndex`` over *reviews* and return its per-listing features.
+
+    See ``ReviewIndex.aggregate`` for *reference_date* and *windows*.
+    """
+    index = ReviewIndex.from_frame(reviews, id_col=id_col, date_col=date_col)
+    return index.aggregate(reference_date=reference_date, windows=windows)
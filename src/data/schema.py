@@ -0,0 +1,241 @@
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ._02_feature_engineering import FIRST_REVIEW_AGE_BINS, LAST_REVIEW_RECENCY_BINS, REVIEW_SCORE_BINS
+from ._02c_dictionary_mapping import CATEGORY_ORDER
+from .amenities import AMENITY_MAPPING
+from .listing_preprocessor import BOOLEAN_COLUMNS, REVIEW_SCORE_COLUMNS, ROOM_TYPE_ORDER
+from .temporal import HOST_TENURE_BINS
+
+# Column kinds, each mapped to the smallest dtype that holds it losslessly:
+#   "id"          int64
+#   "count"       smallest of int8/int16/int32 that fits; float32 if NaN present
+#   "flag"        0/1 → int8 (kept numeric for the scalers in notebook 04)
+#   "bool"        bool
+#   "float"       float32
+#   "coordinate"  float64 (float32 would move a Milan listing by ~0.2 m)
+#   "datetime"    datetime64[ns]
+#   "category"    categorical with the categories found in the data
+#   CategoricalDtype  categorical with these exact categories / order
+SchemaKind = Union[str, pd.CategoricalDtype]
+
+PREPROCESSED_SCHEMA: Dict[str, SchemaKind] = {
+    "id": "id",
+    "last_scraped": "datetime",
+    "latitude": "coordinate",
+    "longitude": "coordinate",
+    "price": "float",
+    # Host
+    "host_location": pd.CategoricalDtype(CATEGORY_ORDER),
+    "host_about_present": "bool",
+    "neighborhood_overview_present": "bool",
+    **{col: "bool" for col in BOOLEAN_COLUMNS},
+    "host_listings_count": "count",
+    "host_total_listings_count": "count",
+    "days_since_host_since": "count",
+    "host_tenure": HOST_TENURE_BINS.dtype,
+    "calculated_host_listings_count": "count",
+    "calculated_host_listings_count_private_rooms": "count",
+    # Listing
+    "neighbourhood_cleansed": "category",
+    "property_type": "category",
+    "room_type": pd.CategoricalDtype(ROOM_TYPE_ORDER, ordered=True),
+    "accommodates": "count",
+    "bathrooms": "float",  # half baths: 1.5, 2.5, ...
+    "bedrooms": "count",
+    "beds": "count",
+    "minimum_nights_avg_ntm": "float",
+    "maximum_nights_avg_ntm": "float",
+    **{col: "flag" for col in AMENITY_MAPPING},
+    # Reviews
+    "number_of_reviews": "count",
+    "number_of_reviews_ltm": "count",
+    "number_of_reviews_l30d": "count",
+    "number_of_reviews_ly": "count",
+    "reviews_per_month": "float",
+    "review_span_days": "count",
+    "days_since_first_review": FIRST_REVIEW_AGE_BINS.dtype,
+    "days_since_last_review": LAST_REVIEW_RECENCY_BINS.dtype,
+    **{col: REVIEW_SCORE_BINS.dtype for col in REVIEW_SCORE_COLUMNS},
+}
+
+_INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _smallest_int(values: np.ndarray) -> np.dtype:
+    lo, hi = (values.min(), values.max()) if len(values) else (0, 0)
+    for dtype in _INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype)
+    raise ValueError("Values exceed the int64 range.")
+
+
+def infer_kind(series: pd.Series) -> SchemaKind:
+    """
+    Kind of a column that has no schema entry, from its current content.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.dtype
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime"
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        finite = values[~np.isnan(values)]
+        if len(finite) and np.isin(finite, (0, 1)).all() and len(finite) == len(values):
+            return "flag"
+        if np.array_equal(finite, np.round(finite)):
+            return "count"
+        return "float"
+    if series.nunique(dropna=True) <= max(len(series) // 2, 1):
+        return "category"
+    return "object"
+
+
+def cast_column(series: pd.Series, kind: SchemaKind) -> pd.Series:
+    """
+    Cast *series* to the dtype of *kind*, refusing lossy conversions.
+
+    Raises
+    ------
+    ValueError
+        If the values do not fit *kind* (e.g. a 2 in a flag column, or a
+        fractional value in a count column).
+    """
+    name = series.name
+    if isinstance(kind, pd.CategoricalDtype):
+        unknown = ~series.isna() & ~series.isin(kind.categories)
+        if unknown.any():
+            sample = series[unknown].unique()[:5].tolist()
+            raise ValueError(f"'{name}': values {sample} are not categories of the schema.")
+        return series.astype(kind)
+    if kind == "category":
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    if kind == "datetime":
+        return pd.to_datetime(series)
+    if kind == "object":
+        return series
+    if kind == "bool":
+        if series.isna().any():
+            raise ValueError(f"'{name}': missing values cannot be stored as bool.")
+        values = series.to_numpy()
+        if values.dtype != bool and not np.isin(values, (0, 1)).all():
+            raise ValueError(f"'{name}': bool column holds values other than 0/1.")
+        return series.astype(bool)
+
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    has_nan = bool(np.isnan(values).any())
+    if kind == "float":
+        return series.astype(np.float32)
+    if kind == "coordinate":
+        return series.astype(np.float64)
+    if kind == "id":
+        if has_nan:
+            raise ValueError(f"'{name}': missing ids.")
+        return series.astype(np.int64)
+    if kind == "flag":
+        if has_nan or not np.isin(values, (0, 1)).all():
+            raise ValueError(f"'{name}': flag column must hold only 0/1.")
+        return series.astype(np.int8)
+    if kind == "count":
+        finite = values[~np.isnan(values)]
+        if not np.array_equal(finite, np.round(finite)):
+            raise ValueError(f"'{name}': count column holds fractional values.")
+        if has_nan:
+            return series.astype(np.float32)
+        return series.astype(_smallest_int(finite))
+    raise ValueError(f"'{name}': unknown schema kind {kind!r}.")
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-column dtype and deep memory usage of two versions of a frame.
+    """
+    bytes_before = before.memory_usage(deep=True, index=False)
+    bytes_after = after.memory_usage(deep=True, index=False).reindex(bytes_before.index)
+    report = pd.DataFrame(
+        {
+            "dtype_before": before.dtypes.astype(str),
+            "dtype_after": after.dtypes.reindex(before.columns).astype(str),
+            "kb_before": bytes_before / 1024,
+            "kb_after": bytes_after / 1024,
+        }
+    )
+    report["saving_pct"] = 100 * (1 - report["kb_after"] / report["kb_before"])
+    return report.sort_values("kb_before", ascending=False)
+
+
+def print_memory_report(report: pd.DataFrame) -> None:
+    total_before = report["kb_before"].sum() / 1024
+    total_after = report["kb_after"].sum() / 1024
+    print(report.round(1).to_string())
+    print(
+        f"\nTotal: {total_before:.1f} MB → {total_after:.1f} MB "
+        f"({100 * (1 - total_after / total_before):.1f}% smaller)"
+    )
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    schema: Mapping[str, SchemaKind] = PREPROCESSED_SCHEMA,
+    report: bool = False,
+) -> pd.DataFrame:
+    """
+    Cast every column to the smallest safe dtype.
+
+    Columns listed in *schema* get their declared kind; any other column is
+    classified by ``infer_kind``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame to optimise (not modified).
+    schema : Mapping[str, SchemaKind], default PREPROCESSED_SCHEMA
+        Column ➜ kind.
+    report : bool, default False
+        Print the before/after memory report.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    out = pd.DataFrame(
+        {col: cast_column(df[col], schema.get(col) or infer_kind(df[col])) for col in df.columns},
+        index=df.index,
+    )
+    if report:
+        print_memory_report(memory_report(df, out))
+    return out
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    schema: Mapping[str, SchemaKind] = PREPROCESSED_SCHEMA,
+    report: bool = True,
+) -> pd.DataFrame:
+    """
+    Optimise *df* with ``optimize_dtypes`` and write it to *path*.
+
+    Returns the optimised frame.
+    """
+    optimized = optimize_dtypes(df, schema, report=report)
+    optimized.to_parquet(path)
+    return optimized
+
+
+def read_parquet(
+    path: Union[str, Path],
+    schema: Mapping[str, SchemaKind] = PREPROCESSED_SCHEMA,
+    columns: Optional[list] = None,
+) -> pd.DataFrame:
+    """
+    Read a Parquet file and enforce *schema*, so files written before the
+    schema existed load with the same dtypes as new ones.
+    """
+    return optimize_dtypes(pd.read_parquet(path, columns=columns), schema)
@@ -0,0 +1,218 @@
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import Transformer
+from shapely.geometry import shape
+
+# Metric CRS used for all geometry work: UTM zone 32N covers Milan
+METRIC_CRS = "EPSG:32632"
+GEOGRAPHIC_CRS = "EPSG:4326"
+
+
+def read_neighbourhoods(path: Union[str, Path], name_field: str = "neighbourhood"):
+    """
+    Read ``neighbourhoods.geojson`` without GeoPandas.
+
+    Returns
+    -------
+    names : np.ndarray[object]
+        Neighbourhood names, in file order.
+    polygons : np.ndarray[shapely.Geometry]
+        Matching (multi)polygons in WGS84 lon/lat.
+    """
+    raw = Path(path).read_bytes()
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except UnicodeDecodeError:
+        # Some Inside Airbnb exports are cp1252 ('PARCO BOSCO IN CITT\x85')
+        data = json.loads(raw.decode("latin-1"))
+
+    names = np.array([f["properties"][name_field] for f in data["features"]], dtype=object)
+    polygons = np.array([shape(f["geometry"]) for f in data["features"]], dtype=object)
+    return names, polygons
+
+
+class NeighbourhoodIndex:
+    """
+    Vectorised point ➜ neighbourhood assignment.
+
+    The polygons are projected to ``METRIC_CRS`` and loaded into a Shapely 2
+    ``STRtree`` once; every call then projects and queries whole coordinate
+    arrays in bulk.
+
+    Parameters
+    ----------
+    names : array-like of str
+        Neighbourhood names.
+    polygons : array-like of shapely geometries
+        Polygons in WGS84 lon/lat, same order as *names*.
+    cell_size : float, default 250.0
+        Side in metres of the cells used to batch points in ``assign``.
+    """
+
+    def __init__(self, names, polygons, cell_size: float = 250.0):
+        self.cell_size = float(cell_size)
+        self.names = np.asarray(names, dtype=object)
+        self._to_metric = Transformer.from_crs(GEOGRAPHIC_CRS, METRIC_CRS, always_xy=True)
+        self.polygons = shapely.transform(
+            np.asarray(polygons, dtype=object),
+            lambda xy: np.column_stack(self._to_metric.transform(xy[:, 0], xy[:, 1])),
+        )
+        shapely.prepare(self.polygons)
+        self.tree = shapely.STRtree(self.polygons)
+        self._bounds = shapely.total_bounds(self.polygons)
+        self.dtype = pd.CategoricalDtype(categories=list(self.names))
+
+        self._cache_ids = pd.Index([], dtype="int64")
+        self._cache_lat = np.zeros(0, dtype=np.float64)
+        self._cache_lon = np.zeros(0, dtype=np.float64)
+        self._cache_codes = np.zeros(0, dtype=np.int16)
+
+    @classmethod
+    def from_geojson(
+        cls,
+        path: Union[str, Path],
+        name_field: str = "neighbourhood",
+        cell_size: float = 250.0,
+    ) -> "NeighbourhoodIndex":
+        return cls(*read_neighbourhoods(path, name_field), cell_size=cell_size)
+
+    def assign(self, lat, lon, max_distance: Optional[float] = None) -> np.ndarray:
+        """
+        Neighbourhood code of every point (index into ``self.names``).
+
+        Points are bucketed into ``cell_size`` square cells and the STRtree is
+        queried once with the unique cells: a cell lying entirely inside one
+        polygon resolves all its points at once, and only points in cells
+        crossed by a boundary get an exact point-in-polygon test. No shapely
+        Point objects are created.
+
+        Parameters
+        ----------
+        lat, lon : array-like of float
+            WGS84 coordinates.
+        max_distance : float | None, optional
+            Points that fall outside every polygon are snapped to the nearest
+            neighbourhood within this many metres. None leaves them at -1.
+
+        Returns
+        -------
+        np.ndarray[int16]
+            Codes, -1 where no neighbourhood matched (or lat/lon missing).
+        """
+        x, y = self._to_metric.transform(
+            np.asarray(lon, dtype=np.float64), np.asarray(lat, dtype=np.float64)
+        )
+        x, y = np.atleast_1d(x), np.atleast_1d(y)
+        codes = np.full(len(x), -1, dtype=np.int16)
+
+        x0, y0, x1, y1 = self._bounds
+        inside = np.isfinite(x) & np.isfinite(y) & (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+        idx = np.flatnonzero(inside)
+        xv, yv = x[idx], y[idx]
+
+        # Unique cells touched by the points
+        cell = self.cell_size
+        cx = ((xv - x0) // cell).astype(np.int64)
+        cy = ((yv - y0) // cell).astype(np.int64)
+        ny = int((y1 - y0) // cell) + 1
+        cells, inverse = np.unique(cx * ny + cy, return_inverse=True)
+        ucx, ucy = cells // ny, cells % ny
+        boxes = shapely.box(x0 + ucx * cell, y0 + ucy * cell, x0 + (ucx + 1) * cell, y0 + (ucy + 1) * cell)
+
+        # Cells fully covered by one polygon resolve directly
+        cell_code = np.full(len(cells), -1, dtype=np.int16)
+        cov_cell, cov_poly = self.tree.query(boxes, predicate="within")
+        cell_code[cov_cell[::-1]] = cov_poly[::-1]  # first polygon wins
+        codes_v = cell_code[inverse]
+
+        # Boundary cells: exact test against each candidate polygon.
+        # 'intersects' semantics (like gpd.sjoin) so points on an edge match;
+        # a point on a shared edge keeps the lowest polygon code.
+        cand_cell, cand_poly = self.tree.query(boxes, predicate="intersects")
+        open_pair = cell_code[cand_cell] == -1
+        cand_cell, cand_poly = cand_cell[open_pair], cand_poly[open_pair]
+        for poly in np.unique(cand_poly):
+            cell_mask = np.zeros(len(cells), dtype=bool)
+            cell_mask[cand_cell[cand_poly == poly]] = True
+            pts = np.flatnonzero(cell_mask[inverse] & (codes_v == -1))
+            hit = shapely.intersects_xy(self.polygons[poly], xv[pts], yv[pts])
+            codes_v[pts[hit]] = poly
+        codes[idx] = codes_v
+
+        if max_distance is not None:
+            outside = np.flatnonzero((codes == -1) & np.isfinite(x) & np.isfinite(y))
+            if len(outside):
+                near_pt, near_poly = self.tree.query_nearest(
+                    shapely.points(x[outside], y[outside]),
+                    max_distance=max_distance,
+                    all_matches=False,
+                )
+                codes[outside[near_pt]] = near_poly
+        return codes
+
+    def assign_names(self, lat, lon, max_distance: Optional[float] = None) -> pd.Categorical:
+        """Like ``assign`` but returns a categorical of neighbourhood names."""
+        return pd.Categorical.from_codes(self.assign(lat, lon, max_distance), dtype=self.dtype)
+
+    def assign_listings(
+        self,
+        df: pd.DataFrame,
+        id_col: str = "id",
+        lat_col: str = "latitude",
+        lon_col: str = "longitude",
+        max_distance: Optional[float] = None,
+    ) -> pd.Series:
+        """
+        Neighbourhood of each listing, reusing earlier results.
+
+        Results are cached by listing id together with its coordinates: a
+        listing is only re-queried when it is new or has moved.
+
+        Returns
+        -------
+        pd.Series
+            Categorical neighbourhood names aligned with *df*.
+        """
+        ids = df[id_col].to_numpy(dtype=np.int64)
+        lat = df[lat_col].to_numpy(dtype=np.float64)
+        lon = df[lon_col].to_numpy(dtype=np.float64)
+
+        pos = self._cache_ids.get_indexer(ids)
+        hit = pos >= 0
+        hit[hit] = (self._cache_lat[pos[hit]] == lat[hit]) & (self._cache_lon[pos[hit]] == lon[hit])
+
+        codes = np.empty(len(ids), dtype=np.int16)
+        codes[hit] = self._cache_codes[pos[hit]]
+        miss = np.flatnonzero(~hit)
+        if len(miss):
+            codes[miss] = self.assign(lat[miss], lon[miss], max_distance)
+            self._update_cache(ids[miss], lat[miss], lon[miss], codes[miss])
+
+        return pd.Series(
+            pd.Categorical.from_codes(codes, dtype=self.dtype),
+            index=df.index,
+            name="neighbourhood",
+        )
+
+    def _update_cache(self, ids, lat, lon, codes) -> None:
+        # Last occurrence wins if an id appears twice in one call
+        ids, keep = np.unique(ids[::-1], return_index=True)
+        keep = len(lat) - 1 - keep
+        lat, lon, codes = lat[keep], lon[keep], codes[keep]
+
+        pos = self._cache_ids.get_indexer(ids)
+        known = pos >= 0
+        self._cache_lat[pos[known]] = lat[known]
+        self._cache_lon[pos[known]] = lon[known]
+        self._cache_codes[pos[known]] = codes[known]
+
+        new = ~known
+        self._cache_ids = self._cache_ids.append(pd.Index(ids[new], dtype="int64"))
+        self._cache_lat = np.concatenate([self._cache_lat, lat[new]])
+        self._cache_lon = np.concatenate([self._cache_lon, lon[new]])
+        self._cache_codes = np.concatenate([self._cache_codes, codes[new]])
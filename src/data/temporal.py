@@ -0,0 +1,127 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .binning import BinSpec
+from .parsing import parse_series
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+# int32 day number used for missing dates
+MISSING_DAY = np.iinfo(np.int32).min
+
+HOST_TENURE_BINS = BinSpec(
+    edges=(365, 1095, 1825, 3650),
+    labels=(
+        'new_host (<= 1 year)',
+        'junior_host (<= 3 years)',
+        'experienced_host (<= 5 years)',
+        'senior_host (<= 10 years)',
+        'veteran_host (over 10 years)',
+    ),
+    nan_label='unknown_tenure',
+)
+
+DATE_COLUMNS = ("first_review", "last_review", "host_since")
+
+
+def day_numbers(values: pd.Series) -> np.ndarray:
+    """
+    Dates → int32 days since 1970-01-01, parsed once with the fixed ISO
+    format. Missing or unparseable dates are ``MISSING_DAY``.
+    """
+    parsed = parse_series(values, "date")[0].to_numpy().astype("datetime64[D]")
+    missing = np.isnat(parsed)
+    days = (parsed - _EPOCH).astype(np.int64)
+    days[missing] = MISSING_DAY
+    return days.astype(np.int32)
+
+
+def day_deltas(reference: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    ``reference - days`` for int32 day numbers of any (broadcastable) shape,
+    as float32 with NaN where either side is missing.
+    """
+    reference = np.asarray(reference, dtype=np.int32)
+    days = np.asarray(days, dtype=np.int32)
+    if days.ndim == 2 and reference.ndim == 1:
+        reference = reference[:, None]
+    delta = (reference - days).astype(np.float32)
+    delta[(reference == MISSING_DAY) | (days == MISSING_DAY)] = np.nan
+    return delta
+
+
+def add_temporal_features(
+    df: pd.DataFrame,
+    date_columns: Sequence[str] = DATE_COLUMNS,
+    reference_column: str = "last_scraped",
+    *,
+    drop_dates: bool = True,
+    derived: bool = True,
+    inplace: bool = False,
+    reference_days: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    """
+    Day deltas of many date columns against one reference in a single step.
+
+    Each column (and the reference) is parsed exactly once; the deltas are
+    computed on a stacked int32 day-number matrix. The reference column is
+    read but never modified.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Listings.
+    date_columns : Sequence[str], default ("first_review", "last_review", "host_since")
+        Each adds ``days_since_{col}`` (float32, NaN when missing).
+    reference_column : str, default "last_scraped"
+        "Today" of every row.
+    drop_dates : bool, default True
+        Drop the original date columns, like ``convert_and_calculate_days``.
+    derived : bool, default True
+        Also add, when their inputs are present:
+        • ``review_span_days``  – last_review − first_review (float32)
+        • ``host_tenure``       – ``HOST_TENURE_BINS`` over days_since_host_since
+    inplace : bool, default False
+        • False – work on a shallow copy and return it
+        • True  – modify *df* directly (also returned)
+    reference_days : np.ndarray | None, optional
+        Precomputed ``day_numbers(df[reference_column])``, to share one parse
+        across several calls.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    date_columns = list(date_columns)
+    missing_cols = [c for c in date_columns + [reference_column] if c not in df.columns]
+    if missing_cols:
+        raise KeyError(f"Columns not found in the DataFrame: {missing_cols}")
+    if not inplace:
+        df = df.copy(deep=False)
+
+    if reference_days is None:
+        reference_days = day_numbers(df[reference_column])
+    days = np.column_stack([day_numbers(df[col]) for col in date_columns]) if date_columns \
+        else np.empty((len(df), 0), dtype=np.int32)
+    deltas = day_deltas(reference_days, days)
+
+    new: Dict[str, np.ndarray] = {
+        f"days_since_{col}": deltas[:, j] for j, col in enumerate(date_columns)
+    }
+    if derived:
+        position = {col: j for j, col in enumerate(date_columns)}
+        if "first_review" in position and "last_review" in position:
+            new["review_span_days"] = day_deltas(days[:, position["last_review"]], days[:, position["first_review"]])
+        if "host_since" in position:
+            tenure = new["days_since_host_since"]
+            new["host_tenure"] = pd.Categorical.from_codes(
+                HOST_TENURE_BINS.codes(tenure), dtype=HOST_TENURE_BINS.dtype
+            )
+
+    if drop_dates:
+        df.drop(columns=date_columns, inplace=True)
+    for name, values in new.items():
+        df[name] = values
+    return df
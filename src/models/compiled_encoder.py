@@ -0,0 +1,253 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+from .sparse import ToDense
+
+# Lookup key shared by None and NaN (NaN != NaN, so it cannot key a dict)
+_MISSING = object()
+
+
+def _key(value: Any) -> Any:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return _MISSING
+    return value
+
+
+def _number(value: Any) -> float:
+    return math.nan if value is None else float(value)
+
+
+@dataclass
+class EncoderPlan:
+    """
+    Flat form of a fitted ``ColumnTransformer`` + ``SelectKBest``: what
+    each *selected* output column is computed from, as plain Python
+    constants and dicts. Outputs that the selector drops are not computed.
+
+    Per input column (``input`` = listing key, ``pos`` = position among the
+    selected features):
+      • numeric     – (input, pos, fill, mean, scale): (x - mean) / scale,
+                      missing x ➜ fill (NaN without an imputer)
+      • one_hot     – (input, fill, {category ➜ pos}, ignore_unknown)
+      • ordinal     – (input, pos, fill, {category ➜ code}, unknown code
+                      or None to raise)
+      • passthrough – (input, pos, fill)
+
+    *zero_as_missing* is set when the pipeline feeds an XGBoost regressor
+    CSR matrices (no ``ToDense`` step, e.g. pipelines built before XGBoost
+    was densified): XGBoost treats their absent (zero) entries as missing,
+    so the plan hands it NaN for every zero.
+    """
+
+    columns: List[str]
+    n_features: int
+    numeric: List[Tuple[str, int, Any, float, float]] = field(default_factory=list)
+    one_hot: List[Tuple[str, Any, Dict[Any, int], bool]] = field(default_factory=list)
+    ordinal: List[Tuple[str, int, Any, Dict[Any, float], Optional[float]]] = field(default_factory=list)
+    passthrough: List[Tuple[str, int, Any]] = field(default_factory=list)
+    zero_as_missing: bool = False
+
+    def encode_row(self, record: Mapping[str, Any]) -> List[float]:
+        """The selected features of one listing, as a list of floats."""
+        row = [0.0] * self.n_features
+        get = record.get
+        for column, pos, fill, mean, scale in self.numeric:
+            value = get(column)
+            if value is None or value != value:
+                value = fill
+            row[pos] = (_number(value) - mean) / scale
+        for column, fill, positions, ignore_unknown in self.one_hot:
+            key = _key(get(column))
+            if key is _MISSING:
+                key = fill
+            pos = positions.get(key)
+            if pos is not None:
+                row[pos] = 1.0
+            elif key not in positions and not ignore_unknown:
+                raise ValueError(f"Found unknown category {get(column)!r} in column '{column}'.")
+        for column, pos, fill, codes, unknown in self.ordinal:
+            key = _key(get(column))
+            if key is _MISSING:
+                key = fill
+            code = codes.get(key, unknown)
+            if code is None:
+                raise ValueError(f"Found unknown category {get(column)!r} in column '{column}'.")
+            row[pos] = code
+        for column, pos, fill in self.passthrough:
+            value = get(column)
+            row[pos] = _number(fill if value is None or value != value else value)
+        return row
+
+    def encode(
+        self,
+        records: Sequence[Mapping[str, Any]],
+        out: Optional[np.ndarray] = None,
+        dtype=np.float64,
+    ) -> np.ndarray:
+        """
+        Encode *records* into ``out[:len(records)]`` (a buffer of at least
+        ``(len(records), n_features)``; allocated with *dtype* when None).
+        """
+        n = len(records)
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=dtype)
+        view = out[:n]
+        for i, record in enumerate(records):
+            view[i] = self.encode_row(record)
+        if self.zero_as_missing:
+            view[view == 0] = np.nan
+        return view
+
+
+def _unwrap(transformer) -> Tuple[Optional[SimpleImputer], Any]:
+    """(optional SimpleImputer, final step) of a column transformer's pipeline."""
+    steps = transformer.steps if isinstance(transformer, Pipeline) else [(None, transformer)]
+    if len(steps) == 1:
+        return None, steps[0][1]
+    if len(steps) == 2 and isinstance(steps[0][1], SimpleImputer):
+        return steps[0][1], steps[1][1]
+    raise ValueError(f"Cannot compile transformer {transformer!r}: expected [SimpleImputer ➜] encoder.")
+
+
+def _fills(imputer: Optional[SimpleImputer], n_columns: int) -> List[Any]:
+    if imputer is None:
+        return [None] * n_columns
+    if imputer.add_indicator or len(imputer.statistics_) != n_columns:
+        raise ValueError("Cannot compile a SimpleImputer that adds indicators or drops columns.")
+    return [None if _key(value) is _MISSING else value for value in imputer.statistics_]
+
+
+def _category(value: Any) -> Any:
+    key = _key(value)
+    return key.item() if isinstance(key, np.generic) else key
+
+
+def export_plan(pipeline: Pipeline) -> EncoderPlan:
+    """
+    Compile the fitted ``preprocessor`` (ColumnTransformer of StandardScaler
+    / OneHotEncoder / OrdinalEncoder / passthrough blocks, optionally after a
+    SimpleImputer) and ``select`` steps of *pipeline* into an EncoderPlan.
+
+    Raises ValueError for steps it cannot reproduce exactly (other
+    transformers, dropped or infrequent one-hot categories).
+    """
+    preprocessor = pipeline.named_steps["preprocessor"]
+    if not isinstance(preprocessor, ColumnTransformer):
+        raise ValueError("The 'preprocessor' step must be a ColumnTransformer.")
+    densified = False
+    for name, step in pipeline.steps[2:-1]:
+        if not isinstance(step, ToDense):
+            raise ValueError(f"Cannot compile pipeline step '{name}' ({type(step).__name__}).")
+        densified = True
+    selected = pipeline.named_steps["select"].get_support(indices=True)
+    position = {int(index): pos for pos, index in enumerate(selected)}
+
+    plan = EncoderPlan(
+        columns=list(preprocessor.feature_names_in_),
+        n_features=len(selected),
+        zero_as_missing=bool(getattr(preprocessor, "sparse_output_", False))
+        and not densified
+        and type(pipeline.steps[-1][1]).__name__ == "XGBRegressor",
+    )
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or name not in preprocessor.output_indices_:
+            continue
+        columns = [plan.columns[c] if isinstance(c, (int, np.integer)) else c for c in np.atleast_1d(columns)]
+        start = preprocessor.output_indices_[name].start
+        if transformer == "passthrough":
+            plan.passthrough += [
+                (column, position[start + i], None) for i, column in enumerate(columns) if start + i in position
+            ]
+            continue
+        imputer, encoder = _unwrap(transformer)
+        fills = _fills(imputer, len(columns))
+
+        if isinstance(encoder, StandardScaler):
+            means = encoder.mean_ if encoder.with_mean else np.zeros(len(columns))
+            scales = encoder.scale_ if encoder.with_std else np.ones(len(columns))
+            plan.numeric += [
+                (column, position[start + i], fills[i], float(means[i]), float(scales[i]))
+                for i, column in enumerate(columns)
+                if start + i in position
+            ]
+        elif isinstance(encoder, OneHotEncoder):
+            if encoder.drop_idx_ is not None or getattr(encoder, "_infrequent_enabled", False):
+                raise ValueError("Cannot compile a OneHotEncoder with dropped or infrequent categories.")
+            offset = start
+            for i, (column, categories) in enumerate(zip(columns, encoder.categories_)):
+                positions = {
+                    _category(category): position.get(offset + j) for j, category in enumerate(categories)
+                }
+                offset += len(categories)
+                # Categories whose column was not selected stay known (no error) but write nothing
+                plan.one_hot.append((column, fills[i], positions, encoder.handle_unknown != "error"))
+        elif isinstance(encoder, OrdinalEncoder):
+            unknown = float(encoder.unknown_value) if encoder.handle_unknown == "use_encoded_value" else None
+            for i, (column, categories) in enumerate(zip(columns, encoder.categories_)):
+                if start + i not in position:
+                    continue
+                codes = {_category(category): float(code) for code, category in enumerate(categories)}
+                if _MISSING in codes:
+                    codes[_MISSING] = float(encoder.encoded_missing_value)
+                plan.ordinal.append((column, position[start + i], fills[i], codes, unknown))
+        else:
+            raise ValueError(f"Cannot compile transformer '{name}' ({type(encoder).__name__}).")
+    return plan
+
+
+class CompiledPredictor:
+    """
+    Dict-to-prediction path of a fitted pipeline that skips pandas and the
+    sklearn transformers: listings are encoded by an ``EncoderPlan`` into a
+    preallocated buffer. XGBoost gets a float32 buffer straight into
+    ``inplace_predict`` (it works in float32 either way); other regressors
+    get ``predict(buffer)`` on float64, the dtype the pipeline hands them.
+
+    Features equal the pipeline's bit for bit, and so do the predictions of
+    XGBoost and tree models. Linear models can differ in the last bit or
+    two (~1e-15), because BLAS sums the dot product over a differently laid
+    out matrix. The buffer is reused across calls, so one instance must not
+    be called from several threads at once.
+
+    Usage
+    -----
+        predictor = CompiledPredictor(final_model)
+        predictor([{"accommodates": 4, "room_type": "Entire home/apt", ...}])
+        ScoringService(predictor)  # as the service's predict_fn
+    """
+
+    def __init__(self, pipeline: Pipeline, max_batch: int = 256):
+        self.plan = export_plan(pipeline)
+        self.regressor = pipeline.steps[-1][1]
+        self._booster = None
+        self._dtype = np.float64
+        if type(self.regressor).__name__ == "XGBRegressor":
+            self._dtype = np.float32
+            best = getattr(self.regressor, "best_iteration", None)
+            self._booster = self.regressor.get_booster()
+            self._predict_kwargs = {
+                "missing": self.regressor.missing,
+                "validate_features": False,
+                "iteration_range": (0, best + 1) if best is not None else (0, 0),
+            }
+        self._buffer = np.empty((max_batch, self.plan.n_features), dtype=self._dtype)
+
+    def encode(self, records: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        if len(records) > len(self._buffer):
+            self._buffer = np.empty((len(records), self.plan.n_features), dtype=self._dtype)
+        return self.plan.encode(records, self._buffer)
+
+    def predict(self, records: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        X = self.encode(records)
+        if self._booster is not None:
+            return np.asarray(self._booster.inplace_predict(X, **self._predict_kwargs), dtype=np.float64)
+        return np.asarray(self.regressor.predict(X), dtype=np.float64)
+
+    __call__ = predict
@@ -0,0 +1,255 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import scipy.sparse as sp
+from sklearn.pipeline import Pipeline
+from threadpoolctl import threadpool_limits
+
+# Bump when the layout below changes: older stores are then recomputed
+EXPLANATIONS_VERSION = 1
+
+_CONTRIBUTIONS = "contributions.parquet"
+_FEATURES = "features.parquet"
+_META = "meta.json"
+# Extra columns of the contributions file
+BASE_VALUE = "_base_value"
+PREDICTION = "_prediction"
+
+
+def pipeline_feature_names(pipeline: Pipeline) -> List[str]:
+    """
+    Names of the features the regressor of *pipeline* sees, read from the
+    fitted steps (e.g. ``accommodates``, ``room_type_Private room``):
+    the preprocessor's output names without their ``<transformer>__``
+    prefix, kept by the ``select`` step.
+    """
+    preprocessor = pipeline.named_steps["preprocessor"]
+    prefixes = {f"{name}__" for name, *_ in getattr(preprocessor, "transformers_", [])}
+    names = []
+    for name in preprocessor.get_feature_names_out():
+        prefix = name.split("__", 1)[0] + "__"
+        names.append(name[len(prefix):] if prefix in prefixes else name)
+    support = pipeline.named_steps["select"].get_support()
+    return [name for name, keep in zip(names, support) if keep]
+
+
+def _booster(pipeline: Pipeline, n_threads: int = 1):
+    """
+    (booster, missing, iteration_range) of the pipeline's XGBoost regressor.
+    The booster is a copy limited to *n_threads*, so the regressor's own
+    ``n_jobs`` (often -1) does not multiply with the batch threads.
+    """
+    regressor = pipeline.steps[-1][1]
+    if type(regressor).__name__ != "XGBRegressor":
+        raise ValueError(f"Native SHAP contributions need an XGBoost regressor, got {type(regressor).__name__}.")
+    best = getattr(regressor, "best_iteration", None)
+    booster = regressor.get_booster().copy()
+    booster.set_param({"nthread": n_threads})
+    return booster, regressor.missing, (0, best + 1) if best is not None else (0, 0)
+
+
+def _explain_batch(transform: Pipeline, booster, missing: float, iteration_range: Tuple[int, int], X: pd.DataFrame):
+    """(transformed features, contributions incl. bias column) of one batch."""
+    import xgboost
+
+    Xt = transform.transform(X)
+    # Same input (CSR or dense) as predict, so missing entries are treated alike
+    contributions = booster.predict(
+        xgboost.DMatrix(Xt, missing=missing, nthread=1),
+        pred_contribs=True,
+        iteration_range=iteration_range,
+        validate_features=False,
+    )
+    features = Xt.toarray() if sp.issparse(Xt) else np.asarray(Xt)
+    return features.astype(np.float32), contributions.astype(np.float32)
+
+
+def _bounded_map(pool: ThreadPoolExecutor, fn: Callable, items: Iterable, window: int) -> Iterator[Tuple[Any, Any]]:
+    """
+    (item, fn(item)) in the order of *items*, with at most *window* calls
+    submitted and not yet consumed at any time.
+    """
+    items = iter(items)
+    pending = deque((item, pool.submit(fn, item)) for item in islice(items, window))
+    while pending:
+        item, future = pending.popleft()
+        result = future.result()
+        pending.extend((following, pool.submit(fn, following)) for following in islice(items, 1))
+        yield item, result
+
+
+def explain_to_store(
+    pipeline: Pipeline,
+    X: pd.DataFrame,
+    path: Union[str, Path],
+    batch_size: int = 2000,
+    n_jobs: Optional[int] = None,
+    force: bool = False,
+) -> "ExplanationStore":
+    """
+    Exact TreeSHAP contributions of every row of *X*, written column-wise
+    to Parquet under *path*.
+
+    Batches of *batch_size* listings are transformed by the pipeline and
+    explained with XGBoost's native ``pred_contribs`` on *n_jobs* threads
+    (None or -1 ➜ all cores; XGBoost releases the GIL), each batch on one native
+    thread. At most two batches per thread are in flight and each becomes
+    a row group as soon as it is done, so memory stays bounded by
+    ``2 * n_jobs`` batches. Global statistics are accumulated on the way
+    and kept in the store's metadata.
+
+    The store is reused as long as the pipeline and *X* are unchanged
+    (joblib hashes in the metadata); *force* recomputes it.
+
+    Layout
+    ------
+        <path>/contributions.parquet  index column, one column per feature,
+                                      _base_value, _prediction (model output)
+        <path>/features.parquet       index column, the transformed feature
+                                      values the model saw
+        <path>/meta.json              names, hashes, base value, importances
+    """
+    path = Path(path)
+    fingerprint = {"version": EXPLANATIONS_VERSION, "model": joblib.hash(pipeline), "data": joblib.hash(X)}
+    if not force and (path / _META).exists():
+        store = ExplanationStore(path)
+        if all(store.meta.get(key) == value for key, value in fingerprint.items()):
+            return store
+
+    feature_names = pipeline_feature_names(pipeline)
+    index_name = X.index.name or "index"
+    path.mkdir(parents=True, exist_ok=True)
+    starts = range(0, len(X), batch_size)
+
+    contribution_writer = features_writer = None
+    abs_sum = np.zeros(len(feature_names))
+    total = np.zeros(len(feature_names))
+    base_value = None
+    n_workers = n_jobs if n_jobs and n_jobs > 0 else os.cpu_count() or 1
+    booster, missing, iteration_range = _booster(pipeline, n_threads=1)
+    transform = pipeline[:-1]
+
+    def explain(start: int):
+        return _explain_batch(transform, booster, missing, iteration_range, X.iloc[start:start + batch_size])
+
+    # One native thread per batch (BLAS / OpenMP pools included): n_workers
+    # batches at a time use n_workers cores, not n_workers x cores
+    with threadpool_limits(limits=1), ThreadPoolExecutor(max_workers=n_workers) as pool:
+        # Results come back in submission order, so row groups follow the order of X
+        for start, (features, contributions) in _bounded_map(pool, explain, starts, window=2 * n_workers):
+            index = pa.array(X.index[start:start + batch_size])
+            shap_values = contributions[:, :-1]
+            abs_sum += np.abs(shap_values).sum(axis=0, dtype=np.float64)
+            total += shap_values.sum(axis=0, dtype=np.float64)
+            base_value = float(contributions[0, -1]) if base_value is None else base_value
+
+            contribution_table = pa.table(
+                [index, *shap_values.T, contributions[:, -1], contributions.sum(axis=1, dtype=np.float64)],
+                names=[index_name, *feature_names, BASE_VALUE, PREDICTION],
+            )
+            features_table = pa.table([index, *features.T], names=[index_name, *feature_names])
+            if contribution_writer is None:
+                contribution_writer = pq.ParquetWriter(path / f"{_CONTRIBUTIONS}.tmp", contribution_table.schema)
+                features_writer = pq.ParquetWriter(path / f"{_FEATURES}.tmp", features_table.schema)
+            contribution_writer.write_table(contribution_table)
+            features_writer.write_table(features_table)
+    if contribution_writer is None:
+        raise ValueError("X has no rows to explain.")
+    contribution_writer.close()
+    features_writer.close()
+    (path / f"{_CONTRIBUTIONS}.tmp").replace(path / _CONTRIBUTIONS)
+    (path / f"{_FEATURES}.tmp").replace(path / _FEATURES)
+
+    meta = {
+        **fingerprint,
+        "feature_names": feature_names,
+        "index_name": index_name,
+        "n_rows": len(X),
+        "base_value": base_value,
+        "mean_abs": dict(zip(feature_names, (abs_sum / len(X)).tolist())),
+        "mean": dict(zip(feature_names, (total / len(X)).tolist())),
+    }
+    (path / _META).write_text(json.dumps(meta, indent=2))
+    return ExplanationStore(path)
+
+
+class ExplanationStore:
+    """
+    Read side of ``explain_to_store``: importances come from the metadata,
+    everything else reads only the Parquet columns / rows it needs.
+
+    Usage
+    -----
+        store = explain_to_store(final_model, X_test, project_root / "data" / "shap" / "test")
+        store.importance().head(15)
+        store.contributions(store.top_features(15))   # impact-direction chart
+        store.explain(listing_id)                     # "why this price"
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.meta: Dict[str, Any] = json.loads((self.path / _META).read_text())
+        self.feature_names: List[str] = self.meta["feature_names"]
+        self.index_name: str = self.meta["index_name"]
+        self.base_value: float = self.meta["base_value"]
+
+    def importance(self) -> pd.DataFrame:
+        """Mean |SHAP| (and mean signed SHAP) per feature, most important first."""
+        frame = pd.DataFrame({
+            "feature": self.feature_names,
+            "mean_abs_shap": [self.meta["mean_abs"][name] for name in self.feature_names],
+            "mean_shap": [self.meta["mean"][name] for name in self.feature_names],
+        })
+        return frame.sort_values("mean_abs_shap", ascending=False, kind="mergesort").reset_index(drop=True)
+
+    def top_features(self, n: int = 15) -> List[str]:
+        return self.importance()["feature"].head(n).tolist()
+
+    def _read(self, file: str, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+        columns = list(self.feature_names if columns is None else columns)
+        table = pq.read_table(self.path / file, columns=[self.index_name, *columns])
+        return table.to_pandas().set_index(self.index_name)
+
+    def contributions(self, features: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """SHAP values of every listing for *features* (default: all), one column each."""
+        return self._read(_CONTRIBUTIONS, features)
+
+    def features(self, features: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Transformed feature values of every listing, aligned with ``contributions``."""
+        return self._read(_FEATURES, features)
+
+    def predictions(self) -> pd.Series:
+        """Model output (log price) of every listing, as the sum of its contributions."""
+        return self._read(_CONTRIBUTIONS, [PREDICTION])[PREDICTION]
+
+    def explain(self, listing, top: Optional[int] = None) -> pd.DataFrame:
+        """
+        Why this price: the contributions of one listing, largest impact
+        first, with the feature values the model saw. ``attrs`` hold the
+        base value and the prediction (both on the model's log scale).
+        """
+        row_filter = pc.field(self.index_name) == listing
+        shap_row = pq.read_table(self.path / _CONTRIBUTIONS, filters=row_filter).to_pandas()
+        if shap_row.empty:
+            raise KeyError(f"Listing {listing!r} is not in the explanation store.")
+        value_row = pq.read_table(self.path / _FEATURES, filters=row_filter).to_pandas()
+        frame = pd.DataFrame({
+            "feature": self.feature_names,
+            "value": value_row.iloc[0][self.feature_names].to_numpy(),
+            "shap": shap_row.iloc[0][self.feature_names].to_numpy(),
+        })
+        frame = frame.reindex(frame["shap"].abs().sort_values(ascending=False, kind="mergesort").index)
+        frame = frame.reset_index(drop=True).head(top)
+        frame.attrs.update(base_value=float(shap_row[BASE_VALUE].iloc[0]), prediction=float(shap_row[PREDICTION].iloc[0]))
+        return frame
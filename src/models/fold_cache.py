@@ -0,0 +1,113 @@
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+from sklearn.base import BaseEstimator, clone
+from sklearn.feature_selection import SelectKBest
+from sklearn.pipeline import Pipeline
+
+# Candidate parameters that can reuse a fold's fitted preprocessor and
+# feature scores: the selector's k and anything of the regressor
+_REGRESSOR_PREFIX = "regressor__"
+_SELECT_K = "select__k"
+
+
+def fold_key(split: str) -> str:
+    """Shared-data key of the cached preprocessing of *split*."""
+    return f"fold_{split}"
+
+
+def is_cacheable(params: Mapping[str, Any]) -> bool:
+    """True when *params* only change ``select__k`` and the regressor."""
+    return all(key == _SELECT_K or key.startswith(_REGRESSOR_PREFIX) for key in params)
+
+
+def feature_ranking(scores: np.ndarray) -> np.ndarray:
+    """
+    Column indices from worst to best univariate score, ordered exactly as
+    ``SelectKBest`` orders them (NaN lowest, stable sort).
+    """
+    scores = np.array(scores, dtype=np.float64)
+    scores[np.isnan(scores)] = np.finfo(scores.dtype).min
+    return np.argsort(scores, kind="mergesort")
+
+
+def selected_columns(ranking: np.ndarray, k) -> np.ndarray:
+    """The columns ``SelectKBest(k)`` keeps, in their original order."""
+    if k == "all":
+        return np.arange(len(ranking))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.sort(ranking[-k:])
+
+
+def prepare_fold(
+    preprocessor: BaseEstimator,
+    selector: SelectKBest,
+    X_train,
+    y_train,
+    X_test=None,
+) -> Dict[str, Any]:
+    """
+    Everything a candidate of any model needs from one training split,
+    computed once: the fitted preprocessor (a clone of *preprocessor*), the
+    transformed train / test matrices and the feature ranking of
+    ``selector.score_func``.
+    """
+    preprocessor = clone(preprocessor)
+    Xt_train = preprocessor.fit_transform(X_train, y_train)
+    scores = selector.score_func(Xt_train, np.asarray(y_train))
+    if isinstance(scores, tuple):
+        scores = scores[0]
+    return {
+        "preprocessor": preprocessor,
+        "train": Xt_train,
+        "test": None if X_test is None else preprocessor.transform(X_test),
+        "ranking": feature_ranking(scores),
+    }
+
+
+def split_params(
+    pipeline: Pipeline,
+    params: Mapping[str, Any],
+) -> Tuple[Any, BaseEstimator]:
+    """(k, unfitted regressor with its candidate parameters) of a candidate."""
+    k = params.get(_SELECT_K, pipeline.named_steps["select"].k)
+    regressor_params = {
+        key[len(_REGRESSOR_PREFIX):]: value for key, value in params.items() if key.startswith(_REGRESSOR_PREFIX)
+    }
+    regressor = clone(pipeline.named_steps["regressor"]).set_params(**regressor_params)
+    return k, regressor
+
+
+def transform_selected(pipeline: Pipeline, X):
+    """Apply the (stateless) steps between ``select`` and the regressor, e.g. ``ToDense``."""
+    for _, step in pipeline.steps[2:-1]:
+        X = step.transform(X)
+    return X
+
+
+def assemble_pipeline(
+    pipeline: Pipeline,
+    fold: Mapping[str, Any],
+    k,
+    regressor: BaseEstimator,
+    y_train,
+) -> Pipeline:
+    """
+    The fitted Pipeline equivalent to the cached fold plus a fitted
+    *regressor*: the fold's preprocessor, a selector fitted on the fold's
+    training matrix, the template's intermediate steps and the regressor.
+    """
+    selector = clone(pipeline.named_steps["select"]).set_params(k=k).fit(fold["train"], np.asarray(y_train))
+    return Pipeline([
+        ("preprocessor", fold["preprocessor"]),
+        ("select", selector),
+        *[(name, clone(step)) for name, step in pipeline.steps[2:-1]],
+        ("regressor", regressor),
+    ])
+
+
+def fold_matrix(fold: Mapping[str, Any], part: str, columns: np.ndarray) -> Optional[Any]:
+    """Selected *columns* of the cached ``"train"`` / ``"test"`` matrix."""
+    matrix = fold[part]
+    return None if matrix is None else matrix[:, columns]
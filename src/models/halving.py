@@ -0,0 +1,134 @@
+import math
+from typing import List, Optional
+
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.utils import check_array
+
+SEARCH_MODES = ("random", "halving")
+HALVING_RESOURCES = ("n_samples", "n_estimators")
+
+# Regressor class ➜ parameter holding its number of trees / boosting rounds
+TREE_PARAMS = {
+    "XGBRegressor": "n_estimators",
+    "LGBMRegressor": "n_estimators",
+    "CatBoostRegressor": "iterations",
+    "GradientBoostingRegressor": "n_estimators",
+    "RandomForestRegressor": "n_estimators",
+    "ExtraTreesRegressor": "n_estimators",
+    "HistGradientBoostingRegressor": "max_iter",
+}
+# Library defaults when the parameter is left unset (None / absent)
+_DEFAULT_TREES = {"CatBoostRegressor": 1000}
+
+# Boosters that can stop early against a validation split
+EARLY_STOPPING_MODELS = ("XGBRegressor", "LGBMRegressor", "CatBoostRegressor", "GradientBoostingRegressor")
+
+# Smallest training subset used by the "n_samples" resource
+MIN_HALVING_SAMPLES = 100
+
+
+def tree_param(regressor: BaseEstimator) -> Optional[str]:
+    """Name of the tree-count parameter of *regressor*, or None."""
+    return TREE_PARAMS.get(type(regressor).__name__)
+
+
+def tree_count(regressor: BaseEstimator) -> int:
+    """Number of trees / rounds *regressor* is configured with."""
+    name = type(regressor).__name__
+    return int(regressor.get_params().get(TREE_PARAMS[name]) or _DEFAULT_TREES.get(name, 100))
+
+
+def supports_early_stopping(regressor: BaseEstimator) -> bool:
+    return type(regressor).__name__ in EARLY_STOPPING_MODELS
+
+
+def n_halving_rounds(n_candidates: int, factor: int) -> int:
+    """Rounds until fewer than *factor* candidates are left (as HalvingRandomSearchCV)."""
+    # 1 + floor(log_factor(n)) in integers: math.log(243, 3) is 4.999...
+    rounds, power = 1, factor
+    while power <= n_candidates:
+        rounds, power = rounds + 1, power * factor
+    return rounds
+
+
+def resource_fraction(round_: int, n_rounds: int, factor: int) -> float:
+    """Share of the full resource at *round_*; the last round gets all of it."""
+    return float(factor) ** (round_ - (n_rounds - 1))
+
+
+def subsample_positions(n_rows: int, fraction: float, seed: int) -> Optional[np.ndarray]:
+    """
+    Positions of the training rows used at *fraction* of the data: a fixed
+    random subset (nested across rounds), or None for all rows.
+    """
+    if fraction >= 1.0:
+        return None
+    size = min(n_rows, max(int(n_rows * fraction), MIN_HALVING_SAMPLES))
+    return np.sort(np.random.default_rng(seed).permutation(n_rows)[:size])
+
+
+def survivors(candidates: List[int], scores: np.ndarray, factor: int) -> List[int]:
+    """
+    Best ``ceil(len / factor)`` of *candidates* by mean score (NaN last,
+    ties to the earlier candidate).
+    """
+    means = scores.mean(axis=1)
+    means = np.where(np.isnan(means), -np.inf, means)
+    order = sorted(range(len(candidates)), key=lambda i: (-means[i], i))
+    keep = max(1, math.ceil(len(candidates) / factor))
+    return [candidates[i] for i in sorted(order[:keep])]
+
+
+class _ValidationMonitor:
+    """
+    ``GradientBoostingRegressor.fit(monitor=...)`` callback: tracks the
+    squared error on a validation split stage by stage and stops after
+    *patience* stages without improvement.
+    """
+
+    def __init__(self, X_val, y_val, patience: int):
+        self.X_val = check_array(X_val, dtype=np.float32, accept_sparse="csr")
+        self.y_val = np.asarray(y_val, dtype=np.float64)
+        self.patience = patience
+        self.raw: Optional[np.ndarray] = None
+        self.best_loss = np.inf
+        self.best_stage = 0
+
+    def __call__(self, stage: int, estimator, _locals) -> bool:
+        if self.raw is None:
+            self.raw = estimator._raw_predict_init(self.X_val).ravel()
+        self.raw += estimator.learning_rate * estimator.estimators_[stage, 0].predict(self.X_val)
+        loss = float(np.mean((self.y_val - self.raw) ** 2))
+        if loss < self.best_loss:
+            self.best_loss, self.best_stage = loss, stage
+        return stage - self.best_stage >= self.patience
+
+
+def fit_with_early_stopping(regressor: BaseEstimator, X, y, X_val, y_val, rounds: int) -> int:
+    """
+    Fit a booster, stopping when the validation loss has not improved for
+    *rounds* rounds. Returns the number of rounds up to the best one, which
+    is what the fitted model predicts with (XGBoost / LightGBM / CatBoost
+    keep the best iteration; GradientBoosting keeps the *rounds* extra
+    stages, as its own ``n_iter_no_change`` does).
+    """
+    name = type(regressor).__name__
+    if name == "XGBRegressor":
+        regressor.set_params(early_stopping_rounds=rounds)
+        regressor.fit(X, y, eval_set=[(X_val, y_val)], verbose=False)
+        return int(regressor.best_iteration) + 1
+    if name == "LGBMRegressor":
+        import lightgbm
+
+        regressor.fit(X, y, eval_set=[(X_val, y_val)], callbacks=[lightgbm.early_stopping(rounds, verbose=False)])
+        return int(regressor.best_iteration_ or regressor.n_estimators)
+    if name == "CatBoostRegressor":
+        regressor.fit(X, y, eval_set=(X_val, y_val), early_stopping_rounds=rounds, verbose=False)
+        return int(regressor.get_best_iteration()) + 1
+    if name == "GradientBoostingRegressor":
+        monitor = _ValidationMonitor(X_val, y_val, rounds)
+        regressor.fit(X, y, monitor=monitor)
+        return monitor.best_stage + 1
+    raise ValueError(f"{name} does not support early stopping.")
+
@@ -0,0 +1,680 @@
+import time
+import warnings
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from sklearn.base import BaseEstimator, clone
+from sklearn.feature_selection import SelectKBest
+from sklearn.metrics import get_scorer, mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, ParameterSampler
+from sklearn.pipeline import Pipeline
+
+from .fold_cache import (
+    assemble_pipeline,
+    fold_key,
+    fold_matrix,
+    is_cacheable,
+    prepare_fold,
+    selected_columns,
+    split_params,
+    transform_selected,
+)
+from .halving import (
+    HALVING_RESOURCES,
+    SEARCH_MODES,
+    fit_with_early_stopping,
+    n_halving_rounds,
+    resource_fraction,
+    subsample_positions,
+    supports_early_stopping,
+    survivors,
+    tree_count,
+    tree_param,
+)
+from .results_store import ResultsStore, data_fingerprint, describe, dump_atomic
+from .scheduler import TaskScheduler, limit_estimator_threads
+from .sparse import (
+    ToDense,
+    accepts_sparse,
+    fold_memory_report,
+    matrix_memory,
+    memory_frame,
+    to_sparse_preprocessor,
+)
+
+
+def build_pipeline(preprocessor: BaseEstimator, model: BaseEstimator, sparse: bool = False) -> Pipeline:
+    """
+    preprocessor ➜ SelectKBest ➜ regressor, the pipeline of notebook 04.
+
+    With *sparse*, the preprocessor always emits CSR and the matrix stays
+    sparse through the selector. Only the regressors of ``SPARSE_MODELS``
+    (LightGBM, linear models) take it as is; every other one gets a
+    ``ToDense`` step on the k selected columns, so its results equal dense
+    mode (also without *sparse*: ColumnTransformer already returns CSR when
+    the one-hot output is below its ``sparse_threshold`` density).
+    """
+    if sparse:
+        preprocessor = to_sparse_preprocessor(preprocessor)
+    densify = [('densify', ToDense())] if model is not None and not accepts_sparse(model) else []
+    return Pipeline([
+        ('preprocessor', preprocessor),
+        ('select', SelectKBest(k=50)),  # Default value, will be tuned if in params
+        *densify,
+        ('regressor', model),
+    ])
+
+
+def outer_score(model, X, y, scoring: str) -> float:
+    """Score of a refitted model on an outer test split."""
+    y_pred = model.predict(X)
+    if scoring == 'r2':
+        return r2_score(y, y_pred)
+    if scoring == 'neg_mean_squared_error':
+        return -mean_squared_error(y, y_pred)
+    if scoring == 'neg_mean_absolute_error':
+        return -mean_absolute_error(y, y_pred)
+    return model.score(X, y)
+
+
+@dataclass
+class SearchUnit:
+    """
+    One hyperparameter search (the work of one ``RandomizedSearchCV.fit``):
+    *candidates* of *model_name*, each scored on the *inner* splits, then
+    the best one refitted on split *split* (and scored on its test part).
+    """
+
+    model_name: str
+    fold: int
+    split: str
+    inner: List[str]
+    candidates: List[Dict[str, Any]]
+
+
+# ------------------------------------------------------------------ tasks
+def _prepare_split(shared, n_threads, split):
+    """
+    Prepare task: fit the preprocessor and score the features once per
+    split. Returns ``{part: matrix_memory(...)}`` of the cached matrices.
+    """
+    X, y = shared["X"], shared["y"]
+    train_idx, test_idx = shared["splits"][split]
+    fold = prepare_fold(
+        shared["preprocessor"],
+        shared["selector"],
+        X.iloc[train_idx],
+        y.iloc[train_idx],
+        None if test_idx is None else X.iloc[test_idx],
+    )
+    shared.publish(fold_key(split), fold)
+    return {part: matrix_memory(fold[part]) for part in ("train", "test") if fold[part] is not None}
+
+
+def _fit_candidate(shared, n_threads, model_name, params, split, options):
+    """
+    Fit one candidate on the train part of *split*.
+
+    *options* (all optional):
+      • "use_cache"       – reuse the split's fold cache when *params* allow it
+                            and all training rows are used (the cache is
+                            fitted on all of them)
+      • "rows_fraction"   – train on this share of the training rows
+      • "trees_fraction"  – scale the regressor's number of trees / rounds
+      • "early_stopping"  – stop boosting after this many rounds without
+                            improvement on the test part of *split*
+
+    Returns (regressor, X_test, y_test, estimator, n_rounds): *regressor*
+    is fitted on the transformed training rows and *X_test* is the
+    transformed test part (None without one); *estimator* is the fitted
+    Pipeline, or ``(fold, k)`` when the fold cache was used (see
+    ``assemble_pipeline``); *n_rounds* is the early-stopped number of
+    rounds, or None.
+    """
+    X, y = shared["X"], shared["y"]
+    train_idx, test_idx = shared["splits"][split]
+    template = shared["pipelines"][model_name]
+    positions = subsample_positions(len(train_idx), options.get("rows_fraction", 1.0), zlib.crc32(split.encode()))
+    rows = train_idx if positions is None else train_idx[positions]
+    y_train = y.iloc[rows]
+    y_test = None if test_idx is None else y.iloc[test_idx]
+
+    # A row subset refits the preprocessor and feature ranking on its own rows,
+    # as the pipeline would, so only full-data fits can reuse the fold cache
+    if options.get("use_cache") and positions is None and is_cacheable(params):
+        fold = shared[fold_key(split)]
+        k, regressor = split_params(template, params)
+        columns = selected_columns(fold["ranking"], k)
+        X_train = transform_selected(template, fold_matrix(fold, "train", columns))
+        X_test = fold_matrix(fold, "test", columns)
+        X_test = None if X_test is None else transform_selected(template, X_test)
+        regressor = limit_estimator_threads(regressor, n_threads)
+        estimator = (fold, k)
+    else:
+        pipeline = limit_estimator_threads(clone(template).set_params(**params), n_threads)
+        features, regressor = pipeline[:-1], pipeline.steps[-1][1]
+        X_train = features.fit_transform(X.iloc[rows], y_train)
+        X_test = None if test_idx is None else features.transform(X.iloc[test_idx])
+        estimator = pipeline
+
+    trees = tree_param(regressor)
+    if trees and options.get("trees_fraction", 1.0) < 1.0:
+        regressor.set_params(**{trees: max(1, int(round(tree_count(regressor) * options["trees_fraction"])))})
+    n_rounds = None
+    if options.get("early_stopping") and X_test is not None and supports_early_stopping(regressor):
+        n_rounds = fit_with_early_stopping(regressor, X_train, y_train, X_test, y_test, options["early_stopping"])
+    else:
+        regressor.fit(X_train, y_train)
+    return regressor, X_test, y_test, estimator, n_rounds
+
+
+def _fit_and_score(shared, n_threads, model_name, params, split, scoring, options):
+    """Inner task: fit one candidate on one inner split; return (validation score, n_rounds, seconds)."""
+    start = time.perf_counter()
+    try:
+        regressor, X_test, y_test, _, n_rounds = _fit_candidate(shared, n_threads, model_name, params, split, options)
+        return get_scorer(scoring)(regressor, X_test, y_test), n_rounds, time.perf_counter() - start
+    except Exception as exc:  # same policy as RandomizedSearchCV(error_score=np.nan)
+        warnings.warn(f"{model_name} failed with {params} on {split}: {exc!r}")
+        return np.nan, None, time.perf_counter() - start
+
+
+def _refit(shared, n_threads, model_name, params, split, scoring, options, return_estimator, save_to=None):
+    """
+    Refit task: fit the best candidate on a whole split; score its test part
+    if it has one. Returns (score, estimator or None, seconds); with
+    *save_to* the fitted estimator is also written there (by the worker, so
+    it is not pickled back just to be saved).
+    """
+    start = time.perf_counter()
+    regressor, X_test, y_test, estimator, _ = _fit_candidate(shared, n_threads, model_name, params, split, options)
+    score = None if y_test is None else outer_score(regressor, X_test, y_test, scoring)
+    seconds = time.perf_counter() - start
+    if not return_estimator and save_to is None:
+        return score, None, seconds
+    template = shared["pipelines"][model_name]
+    if isinstance(estimator, tuple):
+        fold, k = estimator
+        train_idx, _ = shared["splits"][split]
+        estimator = assemble_pipeline(template, fold, k, regressor, shared["y"].iloc[train_idx])
+    # Hand back the estimator with the parallelism it was configured with
+    n_jobs = {key: value for key, value in template.get_params().items() if key.endswith("n_jobs")}
+    estimator = estimator.set_params(**n_jobs)
+    if save_to is not None:
+        dump_atomic(estimator, save_to)
+    return score, estimator if return_estimator else None, seconds
+
+
+# -------------------------------------------------------------- scheduling
+def _best_candidate(scores: np.ndarray) -> int:
+    """Index of the best mean inner score; NaN ranks last, ties go to the first (as in sklearn)."""
+    means = scores.mean(axis=1)
+    return int(np.argmax(np.where(np.isnan(means), -np.inf, means)))
+
+
+def run_search_units(
+    scheduler: TaskScheduler,
+    units: List[SearchUnit],
+    scoring: str,
+    return_estimator: bool = False,
+    cache_folds: bool = True,
+    search: str = "random",
+    factor: int = 3,
+    resource: str = "n_samples",
+    early_stopping_rounds: Optional[int] = None,
+    keep_folds: bool = False,
+    save_paths: Optional[List[Optional[str]]] = None,
+    on_unit_done: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    on_splits_prepared: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run many searches as one flat list of (model, outer fold, candidate,
+    inner fold) tasks, then one refit task per search.
+
+    With *cache_folds*, every split is first preprocessed once (shared by
+    all models and candidates, see ``fold_cache``): candidates that only
+    change ``select__k`` and regressor parameters then fit just the
+    regressor on the cached matrix's top-k columns. The shared data must
+    hold the "preprocessor" and "selector" templates.
+
+    ``search="halving"`` runs successive halving: every round scores the
+    surviving candidates with ``factor`` times more *resource* (share of the
+    training rows, or of the trees for tree ensembles) and keeps the best
+    ``1 / factor``; the last round uses the full resource. All units advance
+    round by round on the same pool. Rounds on a share of the rows refit the
+    preprocessor and selector on those rows, so they skip the fold cache.
+
+    With *early_stopping_rounds*, XGBoost / LightGBM / CatBoost /
+    GradientBoosting candidates stop boosting against the inner validation
+    split; the winner is refitted with the mean number of rounds it needed
+    (written into its ``best_params``).
+
+    Splits already prepared by an earlier call on the same scheduler are
+    reused; with *keep_folds* the inner splits are kept for later calls too
+    (e.g. when the units of one run are submitted model by model).
+
+    Returns, per unit: best_params, best_score (mean inner score, NaN when
+    nothing was tuned), test_score, estimator (None unless requested) and
+    timings (summed seconds of the search and refit tasks). *save_paths*
+    (one path or None per unit) write the refitted estimators to disk, and
+    ``on_unit_done(u, outcome)`` is called as soon as unit *u* is refitted;
+    ``on_splits_prepared({split: {part: matrix_memory}})`` once the splits
+    this call prepares are cached.
+    """
+    inner_splits = sorted({split for unit in units for split in unit.inner})
+    if cache_folds:
+        splits = inner_splits + sorted({unit.split for unit in units})
+        splits = [split for split in splits if fold_key(split) not in scheduler.published]
+        prepared = scheduler.map(_prepare_split, [(split,) for split in splits])
+        scheduler.published.update(fold_key(split) for split in splits)
+        if on_splits_prepared is not None and splits:
+            on_splits_prepared(dict(zip(splits, prepared)))
+
+    regressors = [scheduler.shared["pipelines"][unit.model_name].steps[-1][1] for unit in units]
+    alive = [list(range(len(unit.candidates))) if unit.inner else [] for unit in units]
+    n_rounds = [n_halving_rounds(len(a), factor) if search == "halving" and a else 1 for a in alive]
+    final: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(units)
+    search_seconds = [0.0] * len(units)
+
+    for round_ in range(max(n_rounds, default=0)):
+        tasks, owners = [], []
+        for u, unit in enumerate(units):
+            if not alive[u] or round_ >= n_rounds[u]:
+                continue
+            fraction = resource_fraction(round_, n_rounds[u], factor)
+            by_trees = resource == "n_estimators" and tree_param(regressors[u]) is not None
+            options = {
+                "use_cache": cache_folds,
+                "rows_fraction": 1.0 if by_trees else fraction,
+                "trees_fraction": fraction if by_trees else 1.0,
+                "early_stopping": early_stopping_rounds,
+            }
+            for p, c in enumerate(alive[u]):
+                for s, split in enumerate(unit.inner):
+                    tasks.append((unit.model_name, unit.candidates[c], split, scoring, options))
+                    owners.append((u, p, s))
+        if not tasks:
+            break
+
+        scores = {u: np.full((len(alive[u]), len(units[u].inner)), np.nan) for u, _, _ in owners}
+        rounds = {u: np.full_like(scores[u], np.nan) for u in scores}
+        for (u, p, s), (score, used, seconds) in zip(owners, scheduler.map(_fit_and_score, tasks)):
+            scores[u][p, s] = score
+            rounds[u][p, s] = np.nan if used is None else used
+            search_seconds[u] += seconds
+        for u in scores:
+            if round_ == n_rounds[u] - 1:
+                final[u] = (scores[u], rounds[u])
+            else:
+                alive[u] = survivors(alive[u], scores[u], factor)
+    if cache_folds and not keep_folds:
+        scheduler.discard([fold_key(split) for split in inner_splits])
+
+    best = []
+    for u, unit in enumerate(units):
+        if final[u] is None:
+            best.append({"best_params": {}, "best_score": np.nan})
+            continue
+        scores, rounds = final[u]
+        p = _best_candidate(scores)
+        params = dict(unit.candidates[alive[u][p]])
+        if not np.isnan(rounds[p]).all():
+            params[f"regressor__{tree_param(regressors[u])}"] = int(round(np.nanmean(rounds[p])))
+        best.append({"best_params": params, "best_score": float(np.mean(scores[p]))})
+
+    def _refitted(u, result):
+        score, estimator, seconds = result
+        best[u].update(
+            test_score=score,
+            estimator=estimator,
+            timings={"search_seconds": search_seconds[u], "refit_seconds": seconds},
+        )
+        if on_unit_done is not None:
+            on_unit_done(u, best[u])
+
+    save_paths = save_paths or [None] * len(units)
+    scheduler.map(
+        _refit,
+        [
+            (unit.model_name, b["best_params"], unit.split, scoring, {"use_cache": cache_folds}, return_estimator, path)
+            for unit, b, path in zip(units, best, save_paths)
+        ],
+        callback=_refitted,
+    )
+    return best
+
+
+def _candidates(params: Mapping, n_iter: int, random_state) -> List[Dict[str, Any]]:
+    """The settings ``RandomizedSearchCV(params, n_iter, random_state)`` would try."""
+    if not params:
+        return [{}]
+    return list(ParameterSampler(params, n_iter=n_iter, random_state=random_state))
+
+
+def _search_options(search, n_iter, halving_factor, halving_resource, early_stopping_rounds):
+    """(candidates per search, ``run_search_units`` keyword arguments) of a search mode."""
+    if search not in SEARCH_MODES:
+        raise ValueError(f"Unknown search '{search}'. Expected one of {SEARCH_MODES}.")
+    if halving_resource not in HALVING_RESOURCES:
+        raise ValueError(f"Unknown halving resource '{halving_resource}'. Expected one of {HALVING_RESOURCES}.")
+    if early_stopping_rounds is None:
+        early_stopping_rounds = 50 if search == "halving" else 0
+    options = {
+        "search": search,
+        "factor": halving_factor,
+        "resource": halving_resource,
+        "early_stopping_rounds": early_stopping_rounds or None,
+    }
+    # Halving starts from factor x more candidates for about the same budget
+    n_candidates = n_iter * halving_factor if search == "halving" else n_iter
+    return n_candidates, options
+
+
+def _open_store(store) -> Optional[ResultsStore]:
+    return store if store is None or isinstance(store, ResultsStore) else ResultsStore(store)
+
+
+def _search_spec(fingerprint: str, preprocessor, model_name: str, model_config: Mapping, **settings) -> Dict[str, Any]:
+    """What a stored search result depends on (hashed into its store key)."""
+    return {
+        "data": fingerprint,
+        "preprocessor": preprocessor,
+        "model": model_name,
+        "estimator": model_config['model'],
+        "params": model_config['params'],
+        **settings,
+    }
+
+
+def _record(kind: str, unit: SearchUnit, outcome: Mapping[str, Any], spec: Mapping[str, Any]) -> Dict[str, Any]:
+    """Store record of a finished search."""
+    return {
+        "kind": kind,
+        "model_name": unit.model_name,
+        "fold": unit.fold,
+        "test_score": outcome["test_score"],
+        "best_score": outcome["best_score"],
+        "best_params": outcome["best_params"],
+        "timings": outcome["timings"],
+        "spec": describe(spec),
+    }
+
+
+def _print_fold_memory(memory) -> None:
+    """Print a ``memory_frame`` of outer folds, one line per fold."""
+    print("Feature matrix per outer fold (train + test):")
+    for split, parts in memory.groupby("split", sort=False):
+        print(f"  {split}: {parts['rows'].sum()} x {parts['columns'].iloc[0]} {parts['format'].iloc[0]}, "
+              f"density {parts['nnz'].sum() / (parts['rows'] * parts['columns']).sum():.1%}, "
+              f"{parts['mb'].sum():.1f} MB (dense float64: {parts['dense_mb'].sum():.1f} MB)")
+    print()
+
+
+# ------------------------------------------------------------- entry points
+def nested_cross_validation_regression(X, y, models_and_params, outer_cv=5, inner_cv=3,
+                                       n_iter=20, scoring='r2', random_state=42, *,
+                                       preprocessor, n_jobs=None, threads_per_task=None,
+                                       cache_folds=True, search='random', halving_factor=3,
+                                       halving_resource='n_samples', early_stopping_rounds=None,
+                                       store=None, sparse=False):
+    """
+    Perform nested cross-validation for regression model selection and performance estimation.
+
+    The searches of all models and outer folds are flattened into
+    (model, outer fold, candidate, inner fold) tasks on one process pool;
+    each task gets ``threads_per_task`` threads, so estimators with
+    ``n_jobs=-1`` no longer oversubscribe the machine. Candidates, splits
+    and scores are the same as with one ``RandomizedSearchCV`` per fold.
+
+    Parameters:
+    -----------
+    X : pd.DataFrame, shape (n_samples, n_features)
+        Feature matrix
+    y : pd.Series, shape (n_samples,)
+        Target vector
+    models_and_params : dict
+        Dictionary containing models and their hyperparameter grids
+    outer_cv : int
+        Number of folds for outer cross-validation
+    inner_cv : int
+        Number of folds for inner cross-validation (hyperparameter tuning)
+    n_iter : int
+        Number of parameter settings sampled per search
+    scoring : str
+        Scoring metric
+    random_state : int
+        Random state for reproducibility
+    preprocessor : ColumnTransformer
+        First step of every pipeline
+    n_jobs : int | None
+        Worker processes (None ➜ all cores; 1 ➜ run in this process)
+    threads_per_task : int | None
+        Threads per task (None ➜ cores // n_jobs)
+    cache_folds : bool
+        Fit the preprocessor and score the features once per split instead
+        of once per candidate (same results, see ``fold_cache``)
+    search : str
+        'random' – every candidate gets the full budget (RandomizedSearchCV)
+        'halving' – successive halving over ``n_iter * halving_factor``
+        candidates, see ``run_search_units``
+    halving_factor : int
+        Candidates kept per round (1 / factor) and resource growth
+    halving_resource : str
+        'n_samples' (training rows) or 'n_estimators' (trees; models
+        without trees fall back to rows)
+    early_stopping_rounds : int | None
+        Stop boosting (XGBoost, LightGBM, CatBoost, GradientBoosting) after
+        this many rounds without improvement on the inner validation split.
+        None ➜ 50 with search='halving', off otherwise; 0 disables
+    store : ResultsStore | str | Path | None
+        Persist every (model, outer fold) result (scores, best params,
+        timings, fitted pipeline) as soon as it is done, keyed by the data
+        and the search space; searches already in the store are loaded
+        instead of rerun. Models then run one after the other, so an
+        interrupted run loses at most the model in progress
+    sparse : bool
+        Keep the feature matrix CSR from the ColumnTransformer through
+        SelectKBest, and into LightGBM and the linear models; the others get
+        their k selected columns dense (see ``build_pipeline``) and score as
+        in dense mode (linear solvers on CSR may differ in the last digits).
+        Either way, the memory footprint of the matrices of every outer fold
+        that still has to run is printed
+
+    Returns:
+    --------
+    results : dict
+        Dictionary containing results for each model
+    """
+    outer_cv_splitter = KFold(n_splits=outer_cv, shuffle=True, random_state=random_state)
+    inner_cv_splitter = KFold(n_splits=inner_cv, shuffle=True, random_state=random_state)
+
+    print("=== NESTED CROSS-VALIDATION FOR AIRBNB PRICE PREDICTION ===\n")
+    print(f"Dataset shape: {X.shape}")
+    print(f"Target range: {y.min():.3f} - {y.max():.3f} (log-transformed)")
+    print(f"Outer CV: {outer_cv} folds, Inner CV: {inner_cv} folds")
+    print(f"Hyperparameter search iterations: {n_iter}\n")
+
+    # Split positions are shared by every model: computed once, memory-mapped by the workers
+    splits: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]] = {}
+    for k, (train_idx, test_idx) in enumerate(outer_cv_splitter.split(X)):
+        splits[f"outer{k}"] = (train_idx, test_idx)
+        for s, (tr, va) in enumerate(inner_cv_splitter.split(train_idx)):
+            splits[f"outer{k}_inner{s}"] = (train_idx[tr], train_idx[va])
+
+    if sparse:
+        preprocessor = to_sparse_preprocessor(preprocessor)
+
+    n_candidates, search_options = _search_options(
+        search, n_iter, halving_factor, halving_resource, early_stopping_rounds
+    )
+    if search == 'halving':
+        print(f"Successive halving: {n_candidates} candidates, factor {halving_factor}, "
+              f"resource {halving_resource}\n")
+
+    units = []
+    for model_name, model_config in models_and_params.items():
+        candidates = _candidates(model_config['params'], n_candidates, random_state)
+        for k in range(outer_cv):
+            inner = [f"outer{k}_inner{s}" for s in range(inner_cv)] if model_config['params'] else []
+            units.append(SearchUnit(model_name, k, f"outer{k}", inner, candidates))
+
+    store = _open_store(store)
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(units)
+    specs: List[Optional[Dict[str, Any]]] = [None] * len(units)
+    keys: List[Optional[str]] = [None] * len(units)
+    if store is not None:
+        fingerprint = data_fingerprint(X, y)
+        for u, unit in enumerate(units):
+            specs[u] = _search_spec(
+                fingerprint, preprocessor, unit.model_name, models_and_params[unit.model_name],
+                outer_cv=outer_cv, inner_cv=inner_cv, fold=unit.fold, n_iter=n_iter,
+                scoring=scoring, random_state=random_state, search=search_options, sparse=sparse,
+            )
+            keys[u] = store.key(specs[u])
+            if store.has(keys[u]):
+                outcomes[u] = store.load(keys[u])
+        print(f"Results store {store.root}: {sum(o is not None for o in outcomes)} of {len(units)} "
+              f"searches already done\n")
+    pending = [u for u, outcome in enumerate(outcomes) if outcome is None]
+
+    shared = {
+        "X": X,
+        "y": y,
+        "splits": splits,
+        "pipelines": {
+            name: build_pipeline(preprocessor, cfg['model'], sparse) for name, cfg in models_and_params.items()
+        },
+        "preprocessor": preprocessor,
+        "selector": build_pipeline(preprocessor, None).named_steps['select'],
+    }
+    if pending:
+        with TaskScheduler(shared, n_jobs=n_jobs, threads_per_task=threads_per_task) as scheduler:
+            print(f"Running {len(pending)} searches on {scheduler.n_jobs} workers "
+                  f"x {scheduler.threads_per_task} threads...\n")
+            # Footprint of the outer folds still to run: read off the fold cache
+            # as it is prepared, or refitted here when there is none
+            outer_splits = sorted({units[u].split for u in pending}, key=lambda split: int(split[len("outer"):]))
+            if not cache_folds:
+                _print_fold_memory(fold_memory_report(preprocessor, X, {split: splits[split] for split in outer_splits}))
+
+            def _report_memory(prepared):
+                outer = {split: prepared[split] for split in outer_splits if split in prepared}
+                if outer:
+                    _print_fold_memory(memory_frame(outer))
+
+            # With a store, one model at a time: its results are on disk before the next one starts
+            if store is None:
+                waves = [pending]
+            else:
+                waves = [[u for u in pending if units[u].model_name == name] for name in models_and_params]
+            for wave in filter(None, waves):
+                def _save(i, outcome, wave=wave):
+                    u = wave[i]
+                    store.save(keys[u], _record("outer_fold", units[u], outcome, specs[u]))
+
+                wave_outcomes = run_search_units(
+                    scheduler,
+                    [units[u] for u in wave],
+                    scoring,
+                    cache_folds=cache_folds,
+                    keep_folds=store is not None,
+                    save_paths=None if store is None else [str(store.estimator_path(keys[u])) for u in wave],
+                    on_unit_done=None if store is None else _save,
+                    on_splits_prepared=_report_memory,
+                    **search_options,
+                )
+                for u, outcome in zip(wave, wave_outcomes):
+                    outcomes[u] = outcome
+
+    results = {}
+    for model_name in models_and_params:
+        folds = [o for unit, o in zip(units, outcomes) if unit.model_name == model_name]
+        outer_scores = [o["test_score"] for o in folds]
+        results[model_name] = {
+            'outer_scores': outer_scores,
+            'mean_score': np.mean(outer_scores),
+            'std_score': np.std(outer_scores),
+            'best_params_per_fold': [o["best_params"] for o in folds],
+        }
+        print(f"{model_name}")
+        print(f"  Mean {scoring}: {np.mean(outer_scores):.4f} (+/- {np.std(outer_scores):.4f})")
+        print(f"  Individual fold scores: {[f'{score:.4f}' for score in outer_scores]}")
+        print()
+
+    return results
+
+
+def select_best_model_and_retrain(X, y, models_and_params, results, inner_cv=3, n_iter=50, *,
+                                  preprocessor, n_jobs=None, threads_per_task=None, cache_folds=True,
+                                  search='random', halving_factor=3, halving_resource='n_samples',
+                                  early_stopping_rounds=None, store=None, sparse=False):
+    """
+    Select the best model based on nested CV results and retrain on full dataset.
+
+    The final search runs on the same task scheduler, and accepts the same
+    search options, as ``nested_cross_validation_regression``. With a
+    *store*, the final model is saved there and, when the same search on
+    the same data is already stored, loaded instead of refitted. *sparse*
+    as in ``nested_cross_validation_regression``.
+    """
+    best_model_name = max(results.keys(), key=lambda k: results[k]['mean_score'])
+    best_model_config = models_and_params[best_model_name]
+
+    print(f"=== BEST MODEL SELECTION ===")
+    print(f"Best model: {best_model_name}")
+    print(f"Expected performance: {results[best_model_name]['mean_score']:.4f} "
+          f"(+/- {results[best_model_name]['std_score']:.4f})")
+    print()
+
+    inner_cv_splitter = KFold(n_splits=inner_cv, shuffle=True, random_state=42)
+    all_idx = np.arange(len(X))
+    splits = {"full": (all_idx, None)}
+    for s, (tr, va) in enumerate(inner_cv_splitter.split(all_idx)):
+        splits[f"full_inner{s}"] = (tr, va)
+    inner = [f"full_inner{s}" for s in range(inner_cv)] if best_model_config['params'] else []
+    n_candidates, search_options = _search_options(
+        search, n_iter, halving_factor, halving_resource, early_stopping_rounds
+    )
+    unit = SearchUnit(best_model_name, 0, "full", inner, _candidates(best_model_config['params'], n_candidates, 42))
+
+    store = _open_store(store)
+    if store is not None:
+        spec = _search_spec(
+            data_fingerprint(X, y), preprocessor, best_model_name, best_model_config,
+            refit="full", inner_cv=inner_cv, n_iter=n_iter, scoring='r2', random_state=42, search=search_options,
+            sparse=sparse,
+        )
+        key = store.key(spec)
+        if store.has(key):
+            outcome = store.load(key)
+            print(f"Loaded final model from the results store ({key})")
+            if best_model_config['params']:
+                print(f"Final model hyperparameters: {outcome['best_params']}")
+                print(f"Cross-validation score on full dataset: {outcome['best_score']:.4f}")
+            return store.load_estimator(key), best_model_name
+
+    shared = {
+        "X": X,
+        "y": y,
+        "splits": splits,
+        "pipelines": {best_model_name: build_pipeline(preprocessor, best_model_config['model'], sparse)},
+        "preprocessor": to_sparse_preprocessor(preprocessor) if sparse else preprocessor,
+        "selector": build_pipeline(preprocessor, None).named_steps['select'],
+    }
+    with TaskScheduler(shared, n_jobs=n_jobs, threads_per_task=threads_per_task) as scheduler:
+        outcome = run_search_units(
+            scheduler, [unit], 'r2', return_estimator=True, cache_folds=cache_folds, **search_options
+        )[0]
+
+    final_model = outcome["estimator"]
+    if store is not None:
+        store.save(key, _record("final", unit, outcome, spec), estimator=final_model)
+    if best_model_config['params']:
+        print(f"Final model hyperparameters: {outcome['best_params']}")
+        print(f"Cross-validation score on full dataset: {outcome['best_score']:.4f}")
+    else:
+        print("No hyperparameters to tune for this model.")
+
+    return final_model, best_model_name
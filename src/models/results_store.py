@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+
+# Bump whenever what a stored result means changes (search procedure,
+# record layout): results written under an older version are then ignored.
+STORE_VERSION = 2
+
+_RECORD = "record.json"
+_ESTIMATOR = "estimator.joblib"
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def describe(obj: Any) -> Any:
+    """
+    JSON-able description of a search-space object that is stable across
+    sessions: estimators by class and (recursively) parameters, frozen
+    scipy.stats distributions by name and arguments.
+    """
+    if isinstance(obj, BaseEstimator):
+        cls = type(obj)
+        return {"class": f"{cls.__module__}.{cls.__qualname__}", "params": describe(obj.get_params(deep=False))}
+    if isinstance(obj, Mapping):
+        return {str(key): describe(value) for key, value in sorted(obj.items(), key=lambda item: str(item[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [describe(value) for value in obj]
+    if isinstance(obj, np.ndarray):
+        return describe(obj.tolist())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if hasattr(obj, "dist") and hasattr(obj, "args"):  # frozen scipy.stats distribution
+        return {"dist": obj.dist.name, "args": describe(obj.args), "kwds": describe(obj.kwds)}
+    if callable(obj) and hasattr(obj, "__qualname__"):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    return _ADDRESS.sub("", repr(obj))
+
+
+def data_fingerprint(X: pd.DataFrame, y: pd.Series) -> str:
+    """sha256 of the values, index, columns and dtypes of *X* and *y*."""
+    digest = hashlib.sha256()
+    for obj in (X, y):
+        digest.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        digest.update(repr(obj.dtypes if isinstance(obj, pd.DataFrame) else obj.dtype).encode())
+    return digest.hexdigest()
+
+
+def dump_atomic(value: Any, path: Union[str, Path], compress: int = 3) -> None:
+    """joblib.dump to a temporary file, then rename it into place."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    joblib.dump(value, tmp_path, compress=compress)
+    os.replace(tmp_path, path)
+
+
+class ResultsStore:
+    """
+    On-disk store of finished searches, one folder per result:
+
+        <root>/<key>/record.json       scores, best params, timings, spec
+        <root>/<key>/estimator.joblib  the fitted estimator (optional)
+
+    *key* is a hash of the search's spec (data fingerprint, search space,
+    CV settings), so a changed dataset or grid never reuses a result. The
+    record is written last: a folder without one (e.g. the run died while
+    saving) counts as not done.
+
+    Usage
+    -----
+        store = ResultsStore(project_root / "data" / "nested_cv")
+        key = store.key({"data": data_fingerprint(X, y), "model": ...})
+        if not store.has(key):
+            store.save(key, {"test_score": ...}, estimator=model)
+        store.load(key)["test_score"], store.load_estimator(key)
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    @staticmethod
+    def key(spec: Mapping[str, Any]) -> str:
+        payload = json.dumps({"version": STORE_VERSION, "spec": describe(spec)}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:20]
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def estimator_path(self, key: str) -> Path:
+        return self.path(key) / _ESTIMATOR
+
+    def has(self, key: str) -> bool:
+        return (self.path(key) / _RECORD).exists()
+
+    def save(self, key: str, record: Mapping[str, Any], estimator: Optional[BaseEstimator] = None) -> None:
+        """Write *record* (and *estimator*); the record marks the result as done."""
+        if estimator is not None:
+            dump_atomic(estimator, self.estimator_path(key))
+        record = dict(describe(record), key=key, completed_at=datetime.now(timezone.utc).isoformat())
+        path = self.path(key) / _RECORD
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{_RECORD}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(record, indent=2, sort_keys=True))
+        os.replace(tmp_path, path)
+
+    def load(self, key: str) -> Dict[str, Any]:
+        return json.loads((self.path(key) / _RECORD).read_text())
+
+    def load_estimator(self, key: str) -> BaseEstimator:
+        path = self.estimator_path(key)
+        if not path.exists():
+            raise FileNotFoundError(f"No estimator stored for result {key} in {self.root}.")
+        return joblib.load(path)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Every finished record in the store."""
+        if not self.root.exists():
+            return []
+        return [json.loads(path.read_text()) for path in sorted(self.root.glob(f"*/{_RECORD}"))]
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per finished result: scores and timings, without the specs."""
+        rows = [{key: value for key, value in record.items() if key != "spec"} for record in self.records()]
+        return pd.json_normalize(rows)
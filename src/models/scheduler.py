@@ -0,0 +1,193 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import joblib
+from sklearn.base import BaseEstimator
+from threadpoolctl import threadpool_limits
+
+
+class SharedData(dict):
+    """
+    Task-side view of the shared objects.
+
+    Tasks can ``publish`` derived objects (e.g. a fold's transformed
+    matrices) for the tasks of later ``TaskScheduler.map`` calls. In a pool
+    they are written to the scheduler's folder and memory-mapped by each
+    worker on first access; in-process they stay in this dict.
+    """
+
+    def __init__(self, data: Dict[str, Any], store_dir: Optional[str] = None):
+        super().__init__(data)
+        self.store_dir = store_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.store_dir, f"{key}.joblib")
+
+    def __missing__(self, key: str) -> Any:
+        if self.store_dir is None or not os.path.exists(self._path(key)):
+            raise KeyError(key)
+        value = self[key] = joblib.load(self._path(key), mmap_mode="r")
+        return value
+
+    def publish(self, key: str, value: Any) -> None:
+        if self.store_dir is None:
+            self[key] = value
+            return
+        # Write-then-rename, so no worker ever maps a half-written file
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, self._path(key))
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Drop published objects that no later task needs."""
+        for key in keys:
+            self.pop(key, None)
+            if self.store_dir is not None and os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+
+
+# Per-process state of the pool workers (set by ``_init_worker``)
+_SHARED = SharedData({})
+_THREADS: int = 1
+
+
+def limit_estimator_threads(estimator: BaseEstimator, n_threads: int) -> BaseEstimator:
+    """
+    Cap the native parallelism of *estimator* (and of every nested
+    estimator, e.g. the steps of a Pipeline) to *n_threads*.
+
+    Sets every ``*n_jobs`` parameter and CatBoost's ``thread_count``;
+    BLAS / OpenMP pools are capped separately with threadpoolctl.
+    """
+    params = estimator.get_params(deep=True)
+    updates = {key: n_threads for key, value in params.items() if key.endswith("n_jobs")}
+    for key, value in params.items():
+        if type(value).__module__.startswith("catboost"):
+            updates[f"{key}__thread_count"] = n_threads
+    if type(estimator).__module__.startswith("catboost"):
+        updates["thread_count"] = n_threads
+    return estimator.set_params(**updates) if updates else estimator
+
+
+def _init_worker(data_path: str, n_threads: int) -> None:
+    global _SHARED, _THREADS
+    # Arrays inside the shared objects are memory-mapped read-only, so every
+    # worker reads the same pages instead of receiving its own pickled copy
+    _SHARED = SharedData(joblib.load(data_path, mmap_mode="r"), os.path.dirname(data_path))
+    _THREADS = n_threads
+
+
+def _run_in_worker(fn: Callable, args: Tuple) -> Any:
+    with threadpool_limits(limits=_THREADS):
+        return fn(_SHARED, _THREADS, *args)
+
+
+class TaskScheduler:
+    """
+    Process pool for many small CPU-bound tasks over the same data, without
+    thread oversubscription.
+
+    ``n_jobs`` worker processes each run one task at a time with
+    ``threads_per_task`` threads (threadpoolctl for BLAS / OpenMP, and the
+    task is told the limit so it can cap ``n_jobs`` of its estimators with
+    ``limit_estimator_threads``). The *shared* objects are dumped once with
+    joblib and memory-mapped by every worker.
+
+    Parameters
+    ----------
+    shared : dict
+        Read-only data every task needs (e.g. ``{"X": X, "y": y}``).
+    n_jobs : int | None, optional
+        Worker processes. None ➜ ``os.cpu_count()``; 1 runs the tasks in
+        this process.
+    threads_per_task : int | None, optional
+        Threads per task. None ➜ ``os.cpu_count() // n_jobs`` (at least 1).
+    temp_folder : str | None, optional
+        Where the memory-mapped data is written (default: system temp dir).
+
+    Usage
+    -----
+    ``fn(shared, n_threads, *task)`` must be a module-level function;
+    *shared* is a ``SharedData``.
+
+        with TaskScheduler({"X": X, "y": y}, n_jobs=8) as scheduler:
+            scores = scheduler.map(fit_and_score, tasks)
+    """
+
+    def __init__(
+        self,
+        shared: Dict[str, Any],
+        n_jobs: Optional[int] = None,
+        threads_per_task: Optional[int] = None,
+        temp_folder: Optional[str] = None,
+    ):
+        n_cpus = os.cpu_count() or 1
+        self.shared = shared
+        self.n_jobs = max(1, n_jobs or n_cpus)
+        self.threads_per_task = threads_per_task or max(1, n_cpus // self.n_jobs)
+        self.temp_folder = temp_folder
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tmpdir: Optional[str] = None
+        self._view = SharedData(shared)
+        # Keys published by tasks so far (maintained by the caller)
+        self.published = set()
+
+    def __enter__(self) -> "TaskScheduler":
+        if self.n_jobs > 1:
+            self._tmpdir = tempfile.mkdtemp(prefix="nested_cv_", dir=self.temp_folder)
+            data_path = os.path.join(self._tmpdir, "shared.joblib")
+            joblib.dump(self.shared, data_path)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_init_worker,
+                initargs=(data_path, self.threads_per_task),
+            )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def map(
+        self,
+        fn: Callable,
+        tasks: Iterable[Sequence],
+        callback: Optional[Callable[[int, Any], None]] = None,
+    ) -> List[Any]:
+        """
+        Run ``fn(shared, n_threads, *task)`` for every task; results in task
+        order. *callback* (optional) is called as ``callback(i, result)`` in
+        this process as soon as task *i* finishes.
+        """
+        tasks = [tuple(task) for task in tasks]
+        results: List[Any] = [None] * len(tasks)
+        if self._pool is None:
+            with threadpool_limits(limits=self.threads_per_task):
+                for i, task in enumerate(tasks):
+                    results[i] = fn(self._view, self.threads_per_task, *task)
+                    if callback is not None:
+                        callback(i, results[i])
+            return results
+        futures = {self._pool.submit(_run_in_worker, fn, task): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            if callback is not None:
+                callback(i, results[i])
+        return results
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Free objects published by earlier tasks."""
+        keys = list(keys)
+        self.published.difference_update(keys)
+        if self._pool is None:
+            self._view.discard(keys)
+        else:
+            SharedData({}, self._tmpdir).discard(keys)
@@ -0,0 +1,381 @@
+"""
+Local HTTP scoring service for a fitted price pipeline.
+
+Loads the pipeline once, accepts listing JSON and coalesces concurrent
+requests into micro-batches before calling ``predict``. asyncio and the
+standard library only (plus the model's own dependencies).
+
+    python -m src.models.scoring_service MODEL.joblib [--port 8080] [--window-ms 2] [--max-batch 256] [--no-compile]
+
+Listings are encoded by a ``CompiledPredictor`` (no pandas on the hot
+path) unless the pipeline has steps it cannot compile. The model is loaded
+with ``src`` on ``sys.path``, like the notebooks that pickle it, so its
+``models.*`` classes resolve.
+
+Endpoints
+---------
+POST /predict   one listing object ➜ {"log_price": ..., "price": ...}
+                a list of objects  ➜ a list of those
+GET  /stats     latency percentiles, throughput and batching counters
+GET  /health    {"status": "ok"}
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+# Largest request body accepted (a batch of a few thousand listings)
+MAX_BODY_BYTES = 4 * 2**20
+
+
+def frame_predictor(model, columns: Optional[Sequence[str]] = None) -> Callable[[List[Mapping]], np.ndarray]:
+    """
+    ``predict(records)`` of a fitted pipeline that takes a DataFrame: the
+    records become one frame with the pipeline's input columns (missing
+    keys ➜ NaN, unknown keys dropped).
+    """
+    columns = list(columns if columns is not None else model.feature_names_in_)
+
+    def predict(records: List[Mapping]) -> np.ndarray:
+        return np.asarray(model.predict(pd.DataFrame.from_records(records, columns=columns)), dtype=np.float64)
+
+    return predict
+
+
+class ServiceStats:
+    """
+    Request counters plus a rolling window of the last *window* request
+    latencies (seconds, measured from request read to response written).
+    """
+
+    def __init__(self, window: int = 10_000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.rows = 0
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=window)
+
+    def record(self, latency: float, ok: bool = True) -> None:
+        self.requests += 1
+        self.errors += not ok
+        self._latencies.append((time.perf_counter(), latency))
+
+    def record_batch(self, n_rows: int) -> None:
+        self.batches += 1
+        self.rows += n_rows
+
+    def snapshot(self, recent_seconds: float = 10.0) -> Dict[str, Any]:
+        now = time.perf_counter()
+        latencies = np.array([latency for _, latency in self._latencies])
+        recent = sum(1 for t, _ in self._latencies if now - t <= recent_seconds)
+        uptime = now - self.started
+
+        def ms(q: float) -> Optional[float]:
+            return round(1000 * float(np.percentile(latencies, q)), 3) if len(latencies) else None
+
+        return {
+            "uptime_s": round(uptime, 1),
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": {"p50": ms(50), "p90": ms(90), "p99": ms(99), "max": ms(100)},
+            "throughput_rps": {
+                "overall": round(self.requests / uptime, 1) if uptime else 0.0,
+                f"last_{recent_seconds:g}s": round(recent / min(recent_seconds, uptime), 1) if uptime else 0.0,
+            },
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": round(self.rows / self.batches, 2) if self.batches else None,
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent ``await predict(record)`` calls: the first queued
+    record opens a batch, which is closed *window_ms* later (or as soon as
+    *max_batch* records are waiting) and scored with one ``predict_fn``
+    call on a dedicated thread, so the event loop keeps accepting requests
+    while a batch is scored. A batch that fails is rescored record by
+    record, so one bad listing only fails its own request.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[Mapping]], np.ndarray],
+        window_ms: float = 2.0,
+        max_batch: int = 256,
+        stats: Optional[ServiceStats] = None,
+    ):
+        self.predict_fn = predict_fn
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.stats = stats or ServiceStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict")
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        self._executor.shutdown(wait=False)
+
+    async def predict(self, record: Mapping) -> float:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((record, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.window > 0 and self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.window)
+            while self._queue.qsize() and len(batch) < self.max_batch:
+                batch.append(self._queue.get_nowait())
+            records = [record for record, _ in batch]
+            results = await loop.run_in_executor(self._executor, self._score, records)
+            self.stats.record_batch(len(batch))
+            for (_, future), result in zip(batch, results):
+                if future.done():  # the client went away
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _score(self, records: List[Mapping]) -> List[Any]:
+        try:
+            return [float(value) for value in self.predict_fn(records)]
+        except Exception:
+            if len(records) == 1:
+                return [ValueError(f"Could not score listing: {sys.exc_info()[1]!r}")]
+            return [self._score([record])[0] for record in records]
+
+
+class ScoringService:
+    """
+    HTTP/1.1 front end (keep-alive, JSON bodies) of a ``MicroBatcher``.
+
+    Parameters
+    ----------
+    predict_fn : callable
+        ``predict_fn(records) -> array`` on a list of listing dicts, e.g.
+        ``CompiledPredictor(final_model)`` or ``frame_predictor(final_model)``.
+    window_ms : float, default 2.0
+        How long the first request of a batch waits for others; 0 only
+        batches requests that are already queued.
+    max_batch : int, default 256
+        Largest batch passed to *predict_fn*.
+    inverse : callable | None, default np.expm1
+        Maps a prediction back to a price (the notebooks model log1p(price));
+        None to return the raw prediction only.
+    max_body_bytes : int, default MAX_BODY_BYTES
+        Larger request bodies are refused with 413 (and the connection
+        closed) without being read.
+
+    Usage
+    -----
+        service = ScoringService(frame_predictor(final_model))
+        asyncio.run(service.serve("127.0.0.1", 8080))
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[Mapping]], np.ndarray],
+        window_ms: float = 2.0,
+        max_batch: int = 256,
+        inverse: Optional[Callable[[float], float]] = np.expm1,
+        max_body_bytes: int = MAX_BODY_BYTES,
+    ):
+        self.stats = ServiceStats()
+        self.batcher = MicroBatcher(predict_fn, window_ms, max_batch, self.stats)
+        self.inverse = inverse
+        self.max_body_bytes = max_body_bytes
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        await self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=1024)
+        return self._server
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+
+    def _result(self, value: float) -> Dict[str, float]:
+        result = {"log_price": value}
+        if self.inverse is not None:
+            result["price"] = float(self.inverse(value))
+        return result
+
+    async def _predict(self, body: bytes) -> Tuple[int, Any]:
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError as exc:
+            return 400, {"error": f"Invalid JSON: {exc}"}
+        if isinstance(payload, dict):
+            listings = [payload]
+        elif isinstance(payload, list) and payload and all(isinstance(item, dict) for item in payload):
+            listings = payload
+        else:
+            return 400, {"error": "Expected a listing object or a non-empty list of them."}
+        values = await asyncio.gather(*(self.batcher.predict(listing) for listing in listings), return_exceptions=True)
+        errors = [value for value in values if isinstance(value, Exception)]
+        if errors:
+            return 400, {"error": str(errors[0])}
+        results = [self._result(value) for value in values]
+        return 200, results[0] if isinstance(payload, dict) else results
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        path = path.split("?", 1)[0]
+        if path == "/predict":
+            return await self._predict(body) if method == "POST" else (405, {"error": "Use POST."})
+        if path == "/stats" and method == "GET":
+            return 200, self.stats.snapshot()
+        if path == "/health" and method == "GET":
+            return 200, {"status": "ok"}
+        return 404, {"error": f"No route for {method} {path}."}
+
+    def _content_length(self, headers: Mapping[str, str]) -> Tuple[Optional[int], Optional[Tuple[int, Any]]]:
+        """
+        (body length, None), or (None, error response) when the header is
+        malformed, negative or over the limit. No header means no body.
+        """
+        value = headers.get("content-length", "0").strip() or "0"
+        if not (value.isascii() and value.isdigit()):
+            return None, (400, {"error": f"Invalid Content-Length {value!r}."})
+        length = int(value)
+        if length > self.max_body_bytes:
+            return None, (413, {"error": f"Body of {length} bytes exceeds the {self.max_body_bytes}-byte limit."})
+        return length, None
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+            + data
+        )
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                start = time.perf_counter()
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length, error = self._content_length(headers)
+                if error is not None:
+                    # The body cannot be skipped reliably: answer, then close
+                    await self._respond(writer, *error, keep_alive=False)
+                    if path.startswith("/predict"):
+                        self.stats.record(time.perf_counter() - start, ok=False)
+                    break
+                body = await reader.readexactly(length)
+
+                try:
+                    status, payload = await self._route(method, path, body)
+                except Exception as exc:
+                    status, payload = 500, {"error": repr(exc)}
+                keep_alive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+                await self._respond(writer, status, payload, keep_alive)
+                if path.startswith("/predict"):
+                    self.stats.record(time.perf_counter() - start, ok=status == 200)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("model", help="fitted pipeline saved with joblib (e.g. a results-store estimator.joblib)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-body-bytes", type=int, default=MAX_BODY_BYTES)
+    parser.add_argument("--no-compile", action="store_true", help="score through the pandas pipeline")
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    # The notebooks import this package as ``models.*`` (src on sys.path), so
+    # their pickles refer to e.g. models.sparse.ToDense: load and compile the
+    # pipeline under that same import root
+    src_root = str(Path(__file__).resolve().parents[1])
+    if src_root not in sys.path:
+        sys.path.insert(0, src_root)
+    from models.compiled_encoder import CompiledPredictor
+
+    model = joblib.load(args.model)
+    predict_fn, mode = frame_predictor(model), "pandas pipeline"
+    if not args.no_compile:
+        try:
+            predict_fn, mode = CompiledPredictor(model, max_batch=args.max_batch), "compiled encoder"
+        except ValueError as exc:
+            print(f"Cannot compile the pipeline ({exc}); scoring through pandas.")
+    service = ScoringService(
+        predict_fn, window_ms=args.window_ms, max_batch=args.max_batch, max_body_bytes=args.max_body_bytes
+    )
+    print(f"Scoring {type(model).__name__} ({mode}) on http://{args.host}:{args.port} "
+          f"(window {args.window_ms:g} ms, batches of up to {args.max_batch})")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
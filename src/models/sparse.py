@@ -0,0 +1,117 @@
+from typing import Any, Dict, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder
+
+# Regressors that take the CSR matrix as is: their sparse code paths are
+# fast and give the dense results. Every other regressor gets a ``ToDense``
+# step after feature selection (k columns, not the one-hot width): tree
+# ensembles, KNN and SVR run several times slower on CSR, HistGradientBoosting
+# rejects it, and XGBoost would read every absent (zero) entry as missing.
+SPARSE_MODELS = (
+    "LGBMRegressor",
+    "LinearRegression",
+    "Ridge",
+    "RidgeCV",
+    "Lasso",
+    "LassoCV",
+    "ElasticNet",
+    "ElasticNetCV",
+    "SGDRegressor",
+)
+
+
+def accepts_sparse(regressor: BaseEstimator) -> bool:
+    return type(regressor).__name__ in SPARSE_MODELS
+
+
+def to_sparse_preprocessor(preprocessor: BaseEstimator) -> BaseEstimator:
+    """
+    Unfitted copy of *preprocessor* whose output is always CSR: one-hot
+    encoders emit sparse blocks and every ColumnTransformer stacks its
+    blocks sparsely whatever the overall density (``sparse_threshold=1``).
+    """
+    preprocessor = clone(preprocessor)
+    updates = {}
+    for key, value in preprocessor.get_params(deep=True).items():
+        prefix = f"{key}__" if key else ""
+        if isinstance(value, ColumnTransformer):
+            updates[f"{prefix}sparse_threshold"] = 1.0
+        elif isinstance(value, OneHotEncoder):
+            updates[f"{prefix}sparse_output"] = True
+    if isinstance(preprocessor, ColumnTransformer):
+        updates["sparse_threshold"] = 1.0
+    elif isinstance(preprocessor, OneHotEncoder):
+        updates["sparse_output"] = True
+    return preprocessor.set_params(**updates)
+
+
+class ToDense(TransformerMixin, BaseEstimator):
+    """Stateless step turning a scipy.sparse matrix into a dense array."""
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X.toarray() if sp.issparse(X) else X
+
+    def __sklearn_is_fitted__(self) -> bool:
+        return True
+
+
+def matrix_nbytes(X) -> int:
+    """Bytes held by a dense array, scipy.sparse matrix or DataFrame."""
+    if sp.issparse(X):
+        X = X.tocsr() if X.format not in ("csr", "csc") else X
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    if isinstance(X, pd.DataFrame):
+        return int(X.memory_usage(index=False, deep=True).sum())
+    return np.asarray(X).nbytes
+
+
+def matrix_memory(X) -> Dict[str, Any]:
+    """Shape, format, non-zeros and footprint of a model matrix (vs. dense float64)."""
+    n_rows, n_cols = X.shape
+    nnz = X.nnz if sp.issparse(X) else int(np.count_nonzero(X))
+    return {
+        "format": X.format if sp.issparse(X) else "dense",
+        "rows": n_rows,
+        "columns": n_cols,
+        "nnz": nnz,
+        "density": nnz / max(n_rows * n_cols, 1),
+        "mb": matrix_nbytes(X) / 2**20,
+        "dense_mb": n_rows * n_cols * 8 / 2**20,
+    }
+
+
+def memory_frame(memory: Mapping[str, Mapping[str, Dict[str, Any]]]) -> pd.DataFrame:
+    """``{split: {part: matrix_memory(...)}}`` as one row per (split, part)."""
+    return pd.DataFrame([
+        {"split": split, "part": part, **stats} for split, parts in memory.items() for part, stats in parts.items()
+    ])
+
+
+def fold_memory_report(
+    preprocessor: BaseEstimator,
+    X: pd.DataFrame,
+    splits: Mapping[str, Tuple[np.ndarray, np.ndarray]],
+) -> pd.DataFrame:
+    """
+    Footprint of the transformed train / test matrices of every split: the
+    preprocessor is refitted on each training part, as in cross-validation.
+    One row per (split, part). (With the fold cache, the prepared folds
+    already report it, see ``nested_cv``.)
+    """
+    memory = {}
+    for split, (train_idx, test_idx) in splits.items():
+        fitted = clone(preprocessor).fit(X.iloc[train_idx])
+        memory[split] = {
+            part: matrix_memory(fitted.transform(X.iloc[idx]))
+            for part, idx in (("train", train_idx), ("test", test_idx))
+            if idx is not None
+        }
+    return memory_frame(memory)